@@ -1,22 +1,20 @@
 
 import pickle
 import re
-from googlesearch import search
 import warnings
 warnings.filterwarnings("ignore")
-import requests
 from bs4 import BeautifulSoup
-import time
+from fetcher import get_fetcher
+from Treatment import search_results
+
+fetcher = get_fetcher()
 
 # Fetch disease list from 'www.nhp.gov.in'
 small_alpha = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j', 'k', 'l', 'm', 'n', 'o', 'p', 'q', 'r', 's', 't', 'u', 'v', 'w', 'x', 'y', 'z']
 diseases=[]
-for c in small_alpha:
-    URL = 'https://www.nhp.gov.in/disease-a-z/'+c
-    time.sleep(1)
-    page = requests.get(URL,verify=False)
-
-    soup = BeautifulSoup(page.content, 'html5lib')
+pages = fetcher.fetch_many(['https://www.nhp.gov.in/disease-a-z/'+c for c in small_alpha], verify=False)
+for page in pages:
+    soup = BeautifulSoup(page, 'html5lib')
     all_diseases = soup.find('div', class_='all-disease')
 
     for element in all_diseases.find_all('li'):
@@ -38,18 +36,15 @@ c.sort()
 
 # Search diseases on google, open wikipedia page and fetch symptom from infobox
 
-dis_symp={}
-# dis1=['anthrax']
-for dis in c:
+def disease_symptoms(dis):
+  # Symptoms string from the first wikipedia infobox found for the disease, or None
   query = dis+' wikipedia'
    # search "disease wilipedia" on google 
-  for sr in search(query,tld="co.in",stop=10,pause=0.5): 
+  for sr in search_results(query): 
        # open wikipedia link
     match=re.search(r'wikipedia',sr)
-    filled = 0
     if match:
-      wiki = requests.get(sr,verify=False)
-      soup = BeautifulSoup(wiki.content, 'html5lib')
+      soup = BeautifulSoup(fetcher.get(sr,verify=False), 'html5lib')
        # Fetch HTML code for 'infobox'
       info_table = soup.find("table", {"class":"infobox"})
       if info_table is not None:
@@ -68,12 +63,14 @@ for dis in c:
               symptom=re.sub(r'<[^<]+?>',', ',symptom) # All the tags
               symptom=re.sub(r'\[.*\]','',symptom) # Remove citation text
               symptom=' '.join([x for x in symptom.split() if x != ','])
-              dis_symp[dis]=symptom
-              # print(dis_symp[dis])
-              filled = 1
-              break
-    if filled==1:
-      break
+              return symptom
+  return None
+
+# Diseases are scraped concurrently; results keep the order of `c`
+dis_symp={}
+for dis, symptom in zip(c, fetcher.map(disease_symptoms, c)):
+  if symptom is not None:
+    dis_symp[dis]=symptom
       
 #for key,value in dis_symp.items():
 #  print(key,':',value)
@@ -1,70 +1,59 @@
-
 import os
-import json
 import base64
+import threading
 import pandas as pd
 import streamlit as st
-from langchain.chains import RetrievalQA
-from langchain_core.prompts import PromptTemplate
-from langchain_core.language_models.llms import LLM
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_community.vectorstores import FAISS
-import boto3
-
-# --------------------------
-# Claude LLM via Bedrock
-# --------------------------
-class ClaudeLLM(LLM):
-    model_id: str = "anthropic.claude-3-sonnet-20240229-v1:0"
-    region_name: str = "us-west-2"
-    temperature: float = 0.5
-    max_tokens: int = 1000
-
-    def _call(self, prompt: str, **kwargs) -> str:
-        body = {
-            "anthropic_version": "bedrock-2023-05-31",
-            "messages": [{"role": "user", "content": prompt}],
-            "max_tokens": self.max_tokens,
-            "temperature": self.temperature
-        }
-        client = boto3.client("bedrock-runtime", region_name=self.region_name)
-        response = client.invoke_model(
-            modelId=self.model_id,
-            contentType="application/json",
-            accept="application/json",
-            body=json.dumps(body)
-        )
-        result = json.loads(response["body"].read().decode())
-        return result["content"][0]["text"].strip()
-
-    def _llm_type(self) -> str:
-        return "bedrock-claude"
-
-# --------------------------
-# Prompt Template
-# --------------------------
-CUSTOM_PROMPT_TEMPLATE = """
-Use the pieces of information provided in the context to answer the user's question.
-If you don't know the answer, just say that you don't know — don't make it up.
-Only use information from the provided context.
-
-Context: {context}
-Question: {question}
+from faiss_index import load_vectorstore
+from embeddings import get_embedding_model
+from rag_chain import stream_answer
+from async_pipeline import AsyncRAGPipeline, run_sync
+from answer_cache import AnswerCache
+from index_manifest import index_version
+from quick_topics import get_tailored_prompt
+from warmup import load_or_warm
+from snapshots import SnapshotWatcher
 
-Start the answer directly. Be concise.
-"""
-def set_custom_prompt(template):
-    return PromptTemplate(template=template, input_variables=["context", "question"])
+# Render answers token by token as Claude generates them
+STREAMING = os.getenv("MEDIBOT_STREAMING", "1") == "1"
 
 # --------------------------
 # Load FAISS vectorstore
 # --------------------------
 DB_FAISS_PATH = "vectorstore/db_faiss"
 
+# Serves the published snapshot and swaps in new ones in the background; the
+# Quick Topics answers of a new snapshot are prepared before it goes live
 @st.cache_resource
+def get_watcher():
+    embedding_model = get_embedding_model()
+    return SnapshotWatcher(lambda path: load_vectorstore(path, embedding_model), DB_FAISS_PATH,
+                           on_load=load_or_warm)
+
 def get_vectorstore():
-    embedding_model = HuggingFaceEmbeddings(model_name='sentence-transformers/all-MiniLM-L6-v2')
-    return FAISS.load_local(DB_FAISS_PATH, embedding_model, allow_dangerous_deserialization=True)
+    return get_watcher().current()
+
+# Precomputed Quick Topics answers, recomputed when the index version changes. They
+# are filled in the background; until then, or if that fails, prompts are answered live
+@st.cache_resource(max_entries=2)
+def get_quick_answers(version):
+    path, vectorstore = get_vectorstore()
+    answers = {}
+    def warm():
+        try:
+            answers.update(load_or_warm(vectorstore, path))
+        except Exception as e:
+            print(f"Could not precompute Quick Topics answers: {e}")
+    threading.Thread(target=warm, name="medibot-quick-topics", daemon=True).start()
+    return answers
+
+# Gets the request's snapshot on every call, so it never keeps an old one alive
+@st.cache_resource
+def get_pipeline():
+    return AsyncRAGPipeline()
+
+@st.cache_resource
+def get_answer_cache():
+    return AnswerCache(get_vectorstore()[1].embedding_function)
 
 # --------------------------
 # Initialize session state
@@ -148,43 +137,20 @@ with col2:
 # --------------------------
 # Tailored Quick Topics
 # --------------------------
-def get_tailored_prompt(topic):
-    if topic == "Cold & Flu":
-        return "What are the common symptoms of a cold?"
-
-    elif topic == "Medications":
-        if st.session_state.messages:
-            latest_input = " ".join([m['content'] for m in st.session_state.messages if m['role'] == 'user']).lower()
-            keyword_map = {
-                "allergy": "What OTC medications help with allergies?",
-                "rash": "What OTC treatments are available for skin rashes like poison ivy?",
-                "fever": "What OTC medications can help reduce fever?",
-                "pain": "What are some common pain relievers available over the counter?",
-                "headache": "What are the best OTC medications for headaches?",
-                "cold": "What are good OTC remedies for cold and flu symptoms?",
-                "cough": "What over-the-counter medications relieve coughing?",
-                "itch": "What can relieve itchy skin or insect bites?"
-            }
-            for keyword, response in keyword_map.items():
-                if keyword in latest_input:
-                    return response
-            return f"Based on the user's prior message: '{latest_input}', suggest appropriate over-the-counter medications."
-        else:
-            return "What are some commonly used over-the-counter medications?"
-
-    elif topic == "Wellness Tips":
-        return "Share some daily wellness and self-care habits."
-
-    return ""
-
 st.markdown("### 🔍 Quick Topics")
 c1, c2, c3 = st.columns(3)
 if c1.button("🤒 Cold & Flu"):
-    st.session_state.quick_prompt = get_tailored_prompt("Cold & Flu")
+    st.session_state.quick_prompt = get_tailored_prompt("Cold & Flu", st.session_state.messages)
 if c2.button("💊 Medications"):
-    st.session_state.quick_prompt = get_tailored_prompt("Medications")
+    st.session_state.quick_prompt = get_tailored_prompt("Medications", st.session_state.messages)
 if c3.button("🧘 Wellness Tips"):
-    st.session_state.quick_prompt = get_tailored_prompt("Wellness Tips")
+    st.session_state.quick_prompt = get_tailored_prompt("Wellness Tips", st.session_state.messages)
+
+# Start precomputing Quick Topics answers on server start; later snapshots are warmed by the watcher
+try:
+    get_quick_answers(index_version(get_vectorstore()[0]))
+except Exception as e:
+    st.warning(f"⚠️ Knowledge base unavailable: {str(e)}")
 
 # --------------------------
 # Show Chat History
@@ -226,19 +192,37 @@ if prompt:
         st.stop()
 
     try:
-        vectorstore = get_vectorstore()
-        llm = ClaudeLLM()
-        qa_chain = RetrievalQA.from_chain_type(
-            llm=llm,
-            chain_type="stuff",
-            retriever=vectorstore.as_retriever(search_kwargs={'k': 3}),
-            return_source_documents=False,
-            chain_type_kwargs={'prompt': set_custom_prompt(CUSTOM_PROMPT_TEMPLATE)}
-        )
-        response = qa_chain.invoke({'query': prompt})
-        result = response["result"]
-
-        st.chat_message('assistant').markdown(result)
+        # One snapshot per request, even if a new one is swapped in meanwhile
+        index_path, vectorstore = get_vectorstore()
+        answer_cache = get_answer_cache()
+        version = index_version(index_path)
+        query_vector = None
+        # Quick Topics answers are precomputed; anything else goes through the answer cache
+        result = get_quick_answers(version).get(prompt)
+        if result is None:
+            query_vector = answer_cache.embed(prompt)
+            result = answer_cache.get(prompt, query_vector, version)
+            cached = result is not None
+        else:
+            cached = True
+
+        if cached:
+            st.chat_message('assistant').markdown(result)
+        elif STREAMING:
+            with st.chat_message('assistant'):
+                placeholder = st.empty()
+                result = ""
+                for token in stream_answer(vectorstore, prompt):
+                    result += token
+                    placeholder.markdown(result + "▌")
+                result = result.strip()
+                placeholder.markdown(result)
+        else:
+            result = run_sync(get_pipeline().aanswer(prompt, vectorstore))
+            st.chat_message('assistant').markdown(result)
+        if not cached:
+            answer_cache.put(prompt, result, query_vector, version)
+
         st.session_state.messages.append({'role': 'assistant', 'content': result})
 
     except Exception as e:
@@ -5,10 +5,12 @@ import numpy as np
 import pandas as pd
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
-from itertools import combinations
 from time import time
 from nltk.tokenize import RegexpTokenizer
 from collections import OrderedDict
+from synonym_lexicon import synonyms, update_lexicon, phrase_subsets
+from symptom_dedup import match_symptoms
+from sparse_dataset import build_sparse_dataset, iter_norm_rows, iter_comb_rows, export_dataset, write_rows
 import warnings
 import numpy as np
 import pandas as pd
@@ -16,35 +18,27 @@ from sklearn.metrics import accuracy_score, precision_recall_fscore_support
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.naive_bayes import MultinomialNB
 from statistics import mean
-from nltk.corpus import wordnet 
-import requests
-from bs4 import BeautifulSoup
 from collections import Counter
 import operator
 from xgboost import XGBClassifier
 import math
 
-# returns the list of synonyms of the input word from thesauras.com and wordnet
-def synonyms(term):
-    synonyms = []
-    response = requests.get('https://www.thesaurus.com/browse/{}'.format(term))
-    soup = BeautifulSoup(response.content,  "html.parser")
-    try:
-        container=soup.find('section', {'class': 'MainContentContainer'}) 
-        row=container.find('div',{'class':'css-191l5o0-ClassicContentCard'})
-        row = row.find_all('li')
-        for x in row:
-            synonyms.append(x.get_text())
-    except:
-        None
-    for syn in wordnet.synsets(term):
-        synonyms+=syn.lemma_names()
-    return set(synonyms) 
-
 stop_words = stopwords.words('english')
 lemmatizer = WordNetLemmatizer()
 splitter = RegexpTokenizer(r'\w+')
 
+# Training samples combinations on the fly (train_stream.py), so the comb dataset is
+# only written on request, e.g. ["dis_sym_dataset_comb.csv"] for inspection
+DATASET_COMB_PATHS = []
+DATASET_NORM_PATHS = ["dis_sym_dataset_norm.csv"]
+
+# Combination dataset generation (see sparse_dataset.iter_comb_rows): diseases with
+# more than COMB_MAX_ROWS symptom subsets get a stratified random sample of them
+COMB_MODE = "sampled"  # "all", "sampled" or "weighted"
+COMB_MAX_SIZE = None  # largest subset size, None for no limit
+COMB_MAX_ROWS = 2000  # rows per disease
+COMB_SIZE_WEIGHTS = None  # {subset size: weight} for "weighted"
+
 with open('final_dis_symp.pickle', 'rb') as handle:
     dis_symp = pickle.load(handle)
     
@@ -80,16 +74,16 @@ total_symptoms = list(total_symptoms)
 total_symptoms.sort()
 print(len(total_symptoms))
 
+# Make sure the synonym lexicon covers every sub-phrase of every symptom; only terms
+# it doesn't have yet are looked up online
+print(update_lexicon({subset for s in total_symptoms for subset in phrase_subsets(s)}))
+
 # stores the synonym for each symptomin the list of words
 sym_syn = dict()
 for s in total_symptoms:
-    symp=s.split()
     str_sym=set()
-    for comb in range(1, len(symp)+1):
-        for subset in combinations(symp, comb):
-            subset=' '.join(subset)
-            subset = synonyms(subset) 
-            str_sym.update(subset)
+    for subset in phrase_subsets(s):
+        str_sym.update(synonyms(subset))
     str_sym.add(s)
     str_sym = ' '.join(str_sym).replace('_',' ').lower()
     str_sym = list(set(str_sym.split()))
@@ -98,26 +92,15 @@ for s in total_symptoms:
 #    print(s,":",str_sym)
 print("Done!")
 
-# For each symptom pair in dataset, find Jaccard score of their synonym list.
-# If Jaccard>threshold, it means that those sysnonyms are similar and one of them can be 
-# used in place of other
+# Find symptom pairs whose synonym lists have Jaccard>threshold, which means that those
+# symptoms are similar and one of them can be used in place of other. Candidate pairs
+# come from an inverted token index instead of comparing every pair, and chains of
+# similar symptoms are merged so all of them map to the longest one:
+# symptom_match[symj] = symi
 total_symptoms = sorted(total_symptoms, key=len, reverse=True) 
-symptom_match=dict()
-new_symptoms = set()
-for i,symi in enumerate(total_symptoms):
-    for j in range(i+1,len(total_symptoms)):
-        symj=total_symptoms[j]
-        syn_symi = set(sym_syn[symi])
-        syn_symj = set(sym_syn[symj])
-        jaccard = len(syn_symi.intersection(syn_symj))/len(syn_symi.union(syn_symj))
-        if jaccard>0.75:
-            print(symi,"->",symj)
-            # Store similar symptoms in dictionary, replace symj with symi, so  
-            # symptom_match[symj] = symi
-            if symi in symptom_match.keys():
-                symptom_match[symj] =  symptom_match[symi]
-            else:
-                symptom_match[symj] = symi
+symptom_match, similar_pairs = match_symptoms(total_symptoms, sym_syn, threshold=0.75)
+for symi, symj in similar_pairs:
+    print(symi,"->",symj)
 new_symptoms = set(total_symptoms).difference(set(symptom_match.keys()))
 print(len(new_symptoms))
 
@@ -127,50 +110,29 @@ print(len(new_symptoms))
 total_symptoms = new_symptoms
 total_symptoms = list(total_symptoms)
 total_symptoms.sort()
-total_symptoms=['label_dis']+total_symptoms
 
-# Initialize two dataframes, one for normal dataset and one for combination dataset
-df_comb = pd.DataFrame(columns=total_symptoms)
-df_norm = pd.DataFrame(columns=total_symptoms)
-
-# Read each disease and symptom list, convert into dictionary and add to dataframe
+# For similar symptoms, replace with the value in dictionary
 for key, values in diseases_symptoms_cleaned.items():
-    key = str.encode(key).decode('utf-8')
     tmp = []
-    
-    # For similar symptoms, replace with the value in dictionary
     for symptom in values:
         if symptom in symptom_match.keys():
             tmp.append(symptom_match[symptom])
-            # print(symptom)
         else:
             tmp.append(symptom)
-            
-    values = list(set(tmp))
-    diseases_symptoms_cleaned[key] = values
-    
-    # Populate row for normal
-    row_norm = dict({x:0 for x in total_symptoms})
-    for sym in values:
-        row_norm[sym] = 1
-    row_norm['label_dis']=key
-    df_norm = df_norm.append(pd.Series(row_norm), ignore_index=True)
-         
-    # Populate rows for combination dataset
-    for comb in range(1, len(values) + 1):
-        for subset in combinations(values, comb):
-            row_comb = dict({x:0 for x in total_symptoms})
-            for sym in list(subset):
-                row_comb[sym]=1
-            row_comb['label_dis']=key
-            df_comb = df_comb.append(pd.Series(row_comb), ignore_index=True)
+    diseases_symptoms_cleaned[key] = list(set(tmp))
+
+# Build the norm dataset as a sparse matrix in one pass over the symptom lists
+X_norm, y_norm = build_sparse_dataset(iter_norm_rows(diseases_symptoms_cleaned), total_symptoms)
+print(X_norm.shape)
 
-print(df_comb.shape)
-print(df_norm.shape)
-     
-# Export the dataset into CSV files      
-df_comb.to_csv("dis_sym_dataset_comb.csv",index=None)
-df_norm.to_csv("dis_sym_dataset_norm.csv",index=None)
+# Export the datasets; add more paths to also write .parquet or .npz copies.
+# Comb rows (if requested) are generated lazily and written straight to disk.
+for path in DATASET_COMB_PATHS:
+    comb_rows = iter_comb_rows(diseases_symptoms_cleaned, mode=COMB_MODE, max_size=COMB_MAX_SIZE,
+                               max_rows=COMB_MAX_ROWS, size_weights=COMB_SIZE_WEIGHTS)
+    print(write_rows(comb_rows, total_symptoms, path))
+for path in DATASET_NORM_PATHS:
+    export_dataset(X_norm, y_norm, total_symptoms, path)
 
 # Export disease symptoms into TXT file for better visibility
 with open('dis_symp_dict.txt', 'w') as f:
@@ -9,11 +9,24 @@ from itertools import combinations
 from time import time
 from nltk.tokenize import RegexpTokenizer
 from collections import OrderedDict 
+from sparse_dataset import build_sparse_dataset, iter_norm_rows, iter_comb_rows, export_dataset, write_rows
 
 stop_words = stopwords.words('english')
 lemmatizer = WordNetLemmatizer()
 splitter = RegexpTokenizer(r'\w+')
 
+# Training samples combinations on the fly (train_stream.py), so the comb dataset is
+# only written on request, e.g. ["dis_sym_dataset_comb.csv"] for inspection
+DATASET_COMB_PATHS = []
+DATASET_NORM_PATHS = ["dis_sym_dataset_norm.csv"]
+
+# Combination dataset generation (see sparse_dataset.iter_comb_rows): diseases with
+# more than COMB_MAX_ROWS symptom subsets get a stratified random sample of them
+COMB_MODE = "sampled"  # "all", "sampled" or "weighted"
+COMB_MAX_SIZE = None  # largest subset size, None for no limit
+COMB_MAX_ROWS = 2000  # rows per disease
+COMB_SIZE_WEIGHTS = None  # {subset size: weight} for "weighted"
+
 with open('final_dis_symp.pickle', 'rb') as handle:
     dis_symp = pickle.load(handle)
     
@@ -48,7 +61,6 @@ for key in sorted(dis_symp.keys()):
     
 total_symptoms = list(total_symptoms)
 total_symptoms.sort()
-total_symptoms=['label_dis']+total_symptoms
 
 print(len(diseases_symptoms_cleaned))   
 
@@ -56,38 +68,18 @@ t1=time()
 print(t1-t0)
 
 
-# Initialize two dataframes, one for normal dataset and one for combination dataset
-df_comb = pd.DataFrame(columns=total_symptoms)
-df_norm = pd.DataFrame(columns=total_symptoms)
-
-
-# Read each disease and symptom list, convert into dictionary and add to dataframe
-for key, values in diseases_symptoms_cleaned.items():
-    
-    key = str.encode(key).decode('utf-8')
-    
-    # Populate row for normal
-    row_norm = dict({x:0 for x in total_symptoms})
-    for sym in values:
-        row_norm[sym] = 1
-    row_norm['label_dis']=key
-    df_norm = df_norm.append(pd.Series(row_norm), ignore_index=True)
-         
-    # Populate rows for combination dataset
-    for comb in range(1, len(values) + 1):
-        for subset in combinations(values, comb):
-            row_comb = dict({x:0 for x in total_symptoms})
-            for sym in list(subset):
-                row_comb[sym]=1
-            row_comb['label_dis']=key
-            df_comb = df_comb.append(pd.Series(row_comb), ignore_index=True)
+# Build the norm dataset as a sparse matrix in one pass over the symptom lists
+X_norm, y_norm = build_sparse_dataset(iter_norm_rows(diseases_symptoms_cleaned), total_symptoms)
+print(X_norm.shape)
 
-print(df_comb.shape)
-print(df_norm.shape)
-        
-# Export the dataset into CSV files         
-df_comb.to_csv("dis_sym_dataset_comb.csv",index=None)
-df_norm.to_csv("dis_sym_dataset_norm.csv",index=None)
+# Export the datasets; add more paths to also write .parquet or .npz copies.
+# Comb rows (if requested) are generated lazily and written straight to disk.
+for path in DATASET_COMB_PATHS:
+    comb_rows = iter_comb_rows(diseases_symptoms_cleaned, mode=COMB_MODE, max_size=COMB_MAX_SIZE,
+                               max_rows=COMB_MAX_ROWS, size_weights=COMB_SIZE_WEIGHTS)
+    print(write_rows(comb_rows, total_symptoms, path))
+for path in DATASET_NORM_PATHS:
+    export_dataset(X_norm, y_norm, total_symptoms, path)
 
 t2=time()
 print(t2-t1)
@@ -14,25 +14,15 @@ This notebook contains code to detect disease using the symptoms entered and sel
 # Predicts diseases based on the symptoms entered and selected by the user.
 # importing all necessary libraries
 import warnings
-import numpy as np
-import pandas as pd
-from sklearn.metrics import accuracy_score, precision_recall_fscore_support
-from sklearn.model_selection import train_test_split, cross_val_score
 from statistics import mean
-from nltk.corpus import wordnet 
-import requests
-from bs4 import BeautifulSoup
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
 from nltk.tokenize import RegexpTokenizer
-from itertools import combinations
-from time import time
-from collections import Counter
-import operator
-from xgboost import XGBClassifier
-import math
 from Treatment import diseaseDetail
-from sklearn.linear_model import LogisticRegression
+from disease_model import load_model
+from synonym_lexicon import synonyms, phrase_subsets
+from disease_ranking import DiseaseRanker
+from symptom_matcher import SymptomMatcher
 
 warnings.simplefilter("ignore")
 
@@ -46,26 +36,9 @@ nltk.download('all')
 This is necessary as the user may use a term for a symptom which may be different from the one present in dataset.
 This improves the accuracy by reducing the wrong predictions even when symptoms for a disease are entered slightly different than the ones on which model is trained.
 
-*Synonyms are searched on Thesaurus.com and NLTK Wordnet*
+*Synonyms come from a prebuilt lexicon of Thesaurus.com and NLTK Wordnet results (see synonym_lexicon.py), so lookups are local and memoized*
 """
 
-# returns the list of synonyms of the input word from thesaurus.com (https://www.thesaurus.com/) and wordnet (https://www.nltk.org/howto/wordnet.html)
-def synonyms(term):
-    synonyms = []
-    response = requests.get('https://www.thesaurus.com/browse/{}'.format(term))
-    soup = BeautifulSoup(response.content,  "html.parser")
-    try:
-        container=soup.find('section', {'class': 'MainContentContainer'}) 
-        row=container.find('div',{'class':'css-191l5o0-ClassicContentCard'})
-        row = row.find_all('li')
-        for x in row:
-            synonyms.append(x.get_text())
-    except:
-        None
-    for syn in wordnet.synsets(term):
-        synonyms+=syn.lemma_names()
-    return set(synonyms)
-
 # utlities for pre-processing
 stop_words = stopwords.words('english')
 lemmatizer = WordNetLemmatizer()
@@ -81,35 +54,26 @@ Disease Combination dataset contains the combinations for each of the disease pr
 
  **This increases the size of the data exponentially and helps the model to predict the disease with much better accuracy.**
 
-*df_comb -> Dataframe consisting of dataset generated by combining symptoms for each disease.*
-
-*df_norm -> Dataframe consisting of dataset which contains a single row for each diseases with all the symptoms for that corresponding disease.*
+*Combinations are no longer written to disk; they are sampled on the fly during training (see train_stream.py).*
 
 **Dataset contains 261 diseases and their symptoms**
 """
 
-# Load Dataset scraped from NHP (https://www.nhp.gov.in/disease-a-z) & Wikipedia
-# Scrapping and creation of dataset csv is done in a separate program
-df_comb = pd.read_csv("/content/drive/My Drive/Python Project data/IR_Project/dis_sym_dataset_comb.csv") # Disease combination
-df_norm = pd.read_csv("/content/drive/My Drive/Python Project data/IR_Project/dis_sym_dataset_norm.csv") # Individual Disease
-
-X = df_comb.iloc[:, 1:]
-Y = df_comb.iloc[:, 0:1]
-
-"""Using **Logistic Regression (LR) Classifier** as it gives better accuracy compared to other classification models as observed in the comparison of model accuracies in Model_latest.py
-
-Cross validation is done on dataset with cv = 5
+"""The **Logistic Regression** model (SGD with log loss, trained incrementally on symptom combinations sampled on the fly) is trained separately by train_disease_model.py and saved as a versioned artifact together with the symptom vocabulary, label order, held-out accuracy and symptom index. Here it is only loaded, so the dataset CSV isn't needed.
 """
 
-lr = LogisticRegression()
-lr = lr.fit(X, Y)
-scores = cross_val_score(lr, X, Y, cv=5)
+disease_model = load_model()
+lr = disease_model.classifier
+scores = [disease_model.score]
 
-X = df_norm.iloc[:, 1:]
-Y = df_norm.iloc[:, 0:1]
+# Inverted symptom -> disease index and co-occurrence counts
+symptom_index = disease_model.symptom_index
+if symptom_index is None:
+    raise FileNotFoundError(f"Model {disease_model.version} has no symptom index; retrain it with train_disease_model.py")
 
 # List of symptoms
-dataset_symptoms = list(X.columns)
+dataset_symptoms = disease_model.symptoms
+symptom_matcher = SymptomMatcher(dataset_symptoms)
 
 """# Symptoms initially taken from user."""
 
@@ -129,14 +93,10 @@ for sym in user_symptoms:
 # Taking each user symptom and finding all its synonyms and appending it to the pre-processed symptom string
 user_symptoms = []
 for user_sym in processed_user_symptoms:
-    user_sym = user_sym.split()
     str_sym = set()
-    for comb in range(1, len(user_sym)+1):
-        for subset in combinations(user_sym, comb):
-            subset=' '.join(subset)
-            subset = synonyms(subset) 
-            str_sym.update(subset)
-    str_sym.add(' '.join(user_sym))
+    for subset in phrase_subsets(user_sym):
+        str_sym.update(synonyms(subset))
+    str_sym.add(' '.join(user_sym.split()))
     user_symptoms.append(' '.join(str_sym).replace('_',' '))
 # query expansion performed by joining synonyms found for each symptoms initially entered
 print("After query expansion done by using the symptoms entered")
@@ -147,19 +107,9 @@ print(user_symptoms)
 The symptom synonyms and user symptoms are matched with the symptoms present in dataset. Only the symptoms which matches the symptoms present in dataset are shown back to the user.
 """
 
-# Loop over all the symptoms in dataset and check its similarity score to the synonym string of the user-input 
-# symptoms. If similarity>0.5, add the symptom to the final list
-found_symptoms = set()
-for idx, data_sym in enumerate(dataset_symptoms):
-    data_sym_split=data_sym.split()
-    for user_sym in user_symptoms:
-        count=0
-        for symp in data_sym_split:
-            if symp in user_sym.split():
-                count+=1
-        if count/len(data_sym_split)>0.5:
-            found_symptoms.add(data_sym)
-found_symptoms = list(found_symptoms)
+# Find the symptoms in dataset whose similarity score to the synonym string of the user-input
+# symptoms is >0.5, using a token -> symptom index over the dataset vocabulary
+found_symptoms = symptom_matcher.match(user_symptoms, threshold=0.5)
 
 """## **Prompt the user to select the relevant symptoms by entering the corresponding indices.**"""
 
@@ -173,26 +123,15 @@ select_list = input("\nPlease select the relevant symptoms. Enter indices (separ
 
 # Find other relevant symptoms from the dataset based on user symptoms based on the highest co-occurance with the
 # ones that is input by the user
-dis_list = set()
 final_symp = [] 
-counter_list = []
 for idx in select_list:
-    symp=found_symptoms[int(idx)]
-    final_symp.append(symp)
-    dis_list.update(set(df_norm[df_norm[symp]==1]['label_dis']))
-   
-for dis in dis_list:
-    row = df_norm.loc[df_norm['label_dis'] == dis].values.tolist()
-    row[0].pop(0)
-    for idx,val in enumerate(row[0]):
-        if val!=0 and dataset_symptoms[idx] not in final_symp:
-            counter_list.append(dataset_symptoms[idx])
+    final_symp.append(found_symptoms[int(idx)])
 
 """## To find symptoms which generally co-occur, for example with symptoms like cough, headache generally happens hence they co-occur."""
 
-# Symptoms that co-occur with the ones selected by user              
-dict_symp = dict(Counter(counter_list))
-dict_symp_tup = sorted(dict_symp.items(), key=operator.itemgetter(1),reverse=True)   
+# Symptoms that co-occur with the ones selected by user, counted over the diseases that
+# list any of them, using the precomputed symptom -> disease index
+dict_symp_tup = symptom_index.suggest(final_symp)
 #print(dict_symp_tup)
 
 """## User is presented with a list of co-occuring symptoms to select from and is performed iteratively to recommend more possible symptoms based on the similarity to the previously entered symptoms.
@@ -226,29 +165,22 @@ for tup in dict_symp_tup:
 
 """Final Symptom list"""
 
-# Create query vector based on symptoms selected by the user
+# Print the final symptoms; the ranker turns them into the query vector
 print("\nFinal list of Symptoms that will be used for prediction:")
-sample_x = [0 for x in range(0,len(dataset_symptoms))]
 for val in final_symp:
     print(val)
-    sample_x[dataset_symptoms.index(val)]=1
-
-"""Prediction of disease is done"""
 
-# Predict disease
-lr = LogisticRegression()
-lr = lr.fit(X, Y)
-prediction = lr.predict_proba([sample_x])
+"""Prediction of disease is done.
 
-"""Show top k diseases and their probabilities to the user.
+Show top k diseases and their probabilities to the user.
 
 K in this case is 10
 """
 
 k = 10
-diseases = list(set(Y['label_dis']))
-diseases.sort()
-topk = prediction[0].argsort()[-k:][::-1]
+ranker = DiseaseRanker(lr, symptom_index, mean(scores))
+diseases = ranker.classes
+topk, topk_scores = ranker.rank(ranker.vectorize([final_symp]), k)
 
 """# **Showing the list of top k diseases to the user with their prediction probabilities.**
 
@@ -256,27 +188,12 @@ topk = prediction[0].argsort()[-k:][::-1]
 """
 
 print(f"\nTop {k} diseases predicted based on symptoms")
-topk_dict = {}
-# Show top 10 highly probable disease to the user.
-for idx,t in  enumerate(topk):
-    match_sym=set()
-    row = df_norm.loc[df_norm['label_dis'] == diseases[t]].values.tolist()
-    row[0].pop(0)
-
-    for idx,val in enumerate(row[0]):
-        if val!=0:
-            match_sym.add(dataset_symptoms[idx])
-    prob = (len(match_sym.intersection(set(final_symp)))+1)/(len(set(final_symp))+1)
-    prob *= mean(scores)
-    topk_dict[t] = prob
-j = 0
 topk_index_mapping = {}
-topk_sorted = dict(sorted(topk_dict.items(), key=lambda kv: kv[1], reverse=True))
-for key in topk_sorted:
-  prob = topk_sorted[key]*100
+# Show top 10 highly probable disease to the user.
+for j, (key, prob) in enumerate(zip(topk[0], topk_scores[0])):
+  prob = prob*100
   print(str(j) + " Disease name:",diseases[key], "\tProbability:",str(round(prob, 2))+"%")
   topk_index_mapping[j] = key
-  j += 1
 
 select = input("\nMore details about the disease? Enter index of disease or '-1' to discontinue and close the system:\n")
 if select!='-1':
@@ -2,24 +2,29 @@ import re
 from googlesearch import search
 import warnings
 warnings.filterwarnings("ignore")
-import requests
 from bs4 import BeautifulSoup
+from fetcher import get_fetcher
+
+def search_results(query):
+    # Google results are cached on disk and rate-limited by the shared fetcher
+    return get_fetcher().cached_call("www.google.com", "search:"+query,
+                                     lambda: list(search(query,tld="co.in",stop=10,pause=0.5)))
 
 # Take input a disease and return the content of wikipedia's infobox for that specific disease
 
 def diseaseDetail(term):
+    fetcher = get_fetcher()
     diseases=[term]
     ret=term+"\n"
     for dis in diseases:
         # search "disease wilipedia" on google 
         query = dis+' wikipedia'
-        for sr in search(query,tld="co.in",stop=10,pause=0.5): 
+        for sr in search_results(query): 
             # open wikipedia link
             match=re.search(r'wikipedia',sr)
             filled = 0
             if match:
-                wiki = requests.get(sr,verify=False)
-                soup = BeautifulSoup(wiki.content, 'html5lib')
+                soup = BeautifulSoup(fetcher.get(sr,verify=False), 'html5lib')
                 # Fetch HTML code for 'infobox'
                 info_table = soup.find("table", {"class":"infobox"})
                 if info_table is not None:
@@ -0,0 +1,81 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+
+# Answer cache in front of the RAG chain. A query hits when its normalized text was
+# answered before, or when its embedding is close enough to a cached query's.
+# Entries expire after a TTL, the least recently used ones are evicted first, and
+# everything is dropped when the vectorstore version changes.
+
+THRESHOLD = float(os.getenv("MEDIBOT_CACHE_THRESHOLD", "0.95"))
+TTL = float(os.getenv("MEDIBOT_CACHE_TTL", "86400"))
+MAX_ENTRIES = int(os.getenv("MEDIBOT_CACHE_SIZE", "1000"))
+
+
+def normalize_query(query):
+    query = re.sub(r"\s+", " ", query.strip().lower())
+    return query.rstrip("?!. ")
+
+
+class AnswerCache:
+    def __init__(self, embedding_model, threshold=THRESHOLD, ttl=TTL, max_entries=MAX_ENTRIES):
+        self.embedding_model = embedding_model
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.version = None
+        self.entries = OrderedDict()  # normalized query -> (answer, unit vector, time stored)
+        self.matrix = None  # stacked vectors of `entries`, rebuilt lazily
+        self.keys = []
+        self.lock = threading.Lock()
+
+    def embed(self, query):
+        vector = np.asarray(self.embedding_model.embed_query(normalize_query(query)), dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def _sync(self, version):
+        # A rebuilt vectorstore can change answers, so start over
+        if version != self.version:
+            self.entries.clear()
+            self.matrix = None
+            self.version = version
+
+    def _expire(self):
+        now = time.time()
+        expired = [key for key, (_, _, stored) in self.entries.items() if now - stored > self.ttl]
+        for key in expired:
+            del self.entries[key]
+        if expired:
+            self.matrix = None
+
+    def get(self, query, vector, version):
+        with self.lock:
+            self._sync(version)
+            self._expire()
+            key = normalize_query(query)
+            if key not in self.entries and self.entries:
+                if self.matrix is None:
+                    self.keys = list(self.entries)
+                    self.matrix = np.stack([self.entries[k][1] for k in self.keys])
+                scores = self.matrix @ vector
+                best = int(np.argmax(scores))
+                if scores[best] < self.threshold:
+                    return None
+                key = self.keys[best]
+            if key not in self.entries:
+                return None
+            self.entries.move_to_end(key)
+            return self.entries[key][0]
+
+    def put(self, query, answer, vector, version):
+        with self.lock:
+            self._sync(version)
+            key = normalize_query(query)
+            self.entries[key] = (answer, vector, time.time())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self.matrix = None
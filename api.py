@@ -0,0 +1,91 @@
+import argparse
+import json
+import time
+import tornado.ioloop
+import tornado.web
+from faiss_index import load_vectorstore
+from embeddings import get_embedding_model
+from snapshots import serving_path
+from async_pipeline import AsyncRAGPipeline
+from llm_backends import create_llm, backend_names
+
+# Headless HTTP API around the RAG pipeline (retrieval + CUSTOM_PROMPT_TEMPLATE + LLM).
+#   POST /query        {"query": "..."}          -> {"query", "answer", "latency_ms"}
+#   POST /query/batch  {"queries": ["...", ...]} -> {"results": [{"query", "answer"|"error"}], "latency_ms"}
+#   GET  /health
+
+DB_FAISS_PATH = "vectorstore/db_faiss"
+MAX_BATCH = 32
+
+
+class BaseHandler(tornado.web.RequestHandler):
+    def initialize(self, pipeline):
+        self.pipeline = pipeline
+
+    def read_json(self):
+        try:
+            return json.loads(self.request.body or b"{}")
+        except ValueError:
+            raise tornado.web.HTTPError(400, reason="Body must be JSON")
+
+    def write_error(self, status_code, **kwargs):
+        self.finish({"error": self._reason})
+
+
+class QueryHandler(BaseHandler):
+    async def post(self):
+        query = self.read_json().get("query")
+        if not isinstance(query, str) or not query.strip():
+            raise tornado.web.HTTPError(400, reason="'query' must be a non-empty string")
+        start = time.perf_counter()
+        try:
+            answer = await self.pipeline.aanswer(query)
+        except TimeoutError as e:
+            raise tornado.web.HTTPError(504, reason=str(e))
+        self.write({"query": query, "answer": answer, "latency_ms": (time.perf_counter() - start) * 1000})
+
+
+class BatchQueryHandler(BaseHandler):
+    async def post(self):
+        queries = self.read_json().get("queries")
+        if not isinstance(queries, list) or not queries or not all(isinstance(q, str) and q.strip() for q in queries):
+            raise tornado.web.HTTPError(400, reason="'queries' must be a non-empty list of strings")
+        if len(queries) > MAX_BATCH:
+            raise tornado.web.HTTPError(400, reason=f"At most {MAX_BATCH} queries per batch")
+        start = time.perf_counter()
+        results = []
+        for query, answer in zip(queries, await self.pipeline.abatch(queries)):
+            if isinstance(answer, Exception):
+                results.append({"query": query, "error": str(answer) or type(answer).__name__})
+            else:
+                results.append({"query": query, "answer": answer})
+        self.write({"results": results, "latency_ms": (time.perf_counter() - start) * 1000})
+
+
+class HealthHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.write({"status": "ok"})
+
+
+def make_app(pipeline):
+    return tornado.web.Application([
+        (r"/query", QueryHandler, {"pipeline": pipeline}),
+        (r"/query/batch", BatchQueryHandler, {"pipeline": pipeline}),
+        (r"/health", HealthHandler),
+    ])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MediBot HTTP query API")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--llm", choices=backend_names(), default=None, help="LLM backend (default: MEDIBOT_LLM_BACKEND)")
+    parser.add_argument("--llm-options", type=json.loads, default={}, help='JSON options for the backend, e.g. \'{"latency": 0.5}\'')
+    args = parser.parse_args()
+
+    # The published snapshot, never the directory database.py rebuilds in place
+    db = load_vectorstore(serving_path(DB_FAISS_PATH), get_embedding_model())
+    llm = create_llm(args.llm, **args.llm_options)
+    app = make_app(AsyncRAGPipeline(db, llm=llm))
+    app.listen(args.port)
+    print(f"MediBot API listening on port {args.port} ({llm._llm_type} LLM)")
+    tornado.ioloop.IOLoop.current().start()
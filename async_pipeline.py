@@ -0,0 +1,65 @@
+import asyncio
+import os
+import threading
+from rag_chain import CUSTOM_PROMPT_TEMPLATE, set_custom_prompt, format_context, get_llm
+
+# Asyncio answer pipeline: retrieval and the Claude call are awaited, at most
+# MAX_CONCURRENCY answers are in flight, and each one is cut off after
+# REQUEST_TIMEOUT seconds, counting the time spent queued for a slot. Sync callers (the Streamlit app) submit work to one
+# shared event loop running in a background thread.
+
+MAX_CONCURRENCY = int(os.getenv("MEDIBOT_MAX_CONCURRENCY", "16"))
+REQUEST_TIMEOUT = float(os.getenv("MEDIBOT_REQUEST_TIMEOUT", "60"))
+
+
+class AsyncRAGPipeline:
+    def __init__(self, vectorstore=None, llm=None, prompt_template=CUSTOM_PROMPT_TEMPLATE, k=3,
+                 max_concurrency=MAX_CONCURRENCY, timeout=REQUEST_TIMEOUT):
+        self.vectorstore = vectorstore
+        self.llm = llm or get_llm()
+        self.prompt = set_custom_prompt(prompt_template)
+        self.k = k
+        self.timeout = timeout
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def aretrieve(self, query, vectorstore=None):
+        # `vectorstore` overrides the pipeline's one, e.g. with a freshly swapped-in
+        # snapshot; a pipeline built without one needs it on every call
+        return await (vectorstore or self.vectorstore).asimilarity_search(query, k=self.k)
+
+    async def _answer(self, query, vectorstore=None):
+        docs = await self.aretrieve(query, vectorstore)
+        answer = await self.llm.ainvoke(self.prompt.format(context=format_context(docs), question=query))
+        return answer.strip()
+
+    async def _queued_answer(self, query, vectorstore=None):
+        async with self.semaphore:
+            return await self._answer(query, vectorstore)
+
+    async def aanswer(self, query, vectorstore=None):
+        try:
+            return await asyncio.wait_for(self._queued_answer(query, vectorstore), self.timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"No answer within {self.timeout:g} seconds") from None
+
+    async def abatch(self, queries):
+        # Failed or timed-out queries come back as their exception
+        return await asyncio.gather(*(self.aanswer(query) for query in queries), return_exceptions=True)
+
+
+# --------------------------
+# Shared event loop for sync callers
+# --------------------------
+_loop = None
+_loop_lock = threading.Lock()
+
+def get_event_loop():
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="medibot-async", daemon=True).start()
+        return _loop
+
+def run_sync(coro):
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result()
@@ -0,0 +1,58 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import boto3
+from botocore.config import Config
+
+# One Bedrock client per (region, service) shared by every thread in the process.
+# boto3 clients are thread-safe and keep a pool of open HTTPS connections, so
+# reusing them skips client construction and the TLS handshake on each answer.
+
+REGION = os.getenv("MEDIBOT_BEDROCK_REGION", "us-west-2")
+POOL_SIZE = int(os.getenv("MEDIBOT_BEDROCK_POOL_SIZE", "25"))
+MAX_ATTEMPTS = int(os.getenv("MEDIBOT_BEDROCK_MAX_ATTEMPTS", "4"))
+RETRY_MODE = os.getenv("MEDIBOT_BEDROCK_RETRY_MODE", "adaptive")  # legacy, standard or adaptive
+CONNECT_TIMEOUT = float(os.getenv("MEDIBOT_BEDROCK_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("MEDIBOT_BEDROCK_READ_TIMEOUT", "60"))
+
+_clients = {}
+_executor = None
+_lock = threading.Lock()
+
+
+def client_config(pool_size=POOL_SIZE, max_attempts=MAX_ATTEMPTS, retry_mode=RETRY_MODE):
+    # botocore retries throttling and transient errors with exponential backoff
+    return Config(
+        max_pool_connections=pool_size,
+        retries={"max_attempts": max_attempts, "mode": retry_mode},
+        connect_timeout=CONNECT_TIMEOUT,
+        read_timeout=READ_TIMEOUT,
+        tcp_keepalive=True,
+    )
+
+
+def get_bedrock_client(region: str = REGION, runtime: bool = True):
+    key = (region, runtime)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _lock:
+        if key not in _clients:
+            # Sessions aren't thread-safe, so each client gets its own
+            session = boto3.session.Session()
+            _clients[key] = session.client(
+                service_name="bedrock-runtime" if runtime else "bedrock",
+                region_name=region,
+                config=client_config(),
+            )
+        return _clients[key]
+
+
+def get_bedrock_executor():
+    # Fixed pool that runs blocking Bedrock calls for async callers; sized to the
+    # connection pool so waiting requests queue here instead of spawning threads
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=POOL_SIZE, thread_name_prefix="bedrock")
+        return _executor
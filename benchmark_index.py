@@ -0,0 +1,92 @@
+import argparse
+import time
+import zlib
+import faiss
+import numpy as np
+from embeddings import get_embedding_model
+from faiss_index import DEFAULT_PARAMS, INDEX_TYPES, build_index, flat_vectors, set_search_params
+from quick_topics import canned_prompts
+from database import DB_FAISS_PATH, load_existing_vectorstore
+from index_manifest import load_manifest
+
+# Compares index types on the current corpus: recall@k against the exact flat
+# index, per-query search latency, build time and index size in memory (also as a
+# percentage of the flat index). It also reports how much zlib saves on chunk texts.
+# Queries are the Quick Topics prompts plus a sample of stored chunk vectors.
+#   python benchmark_index.py --k 3 --queries 500
+
+
+def index_bytes(index):
+    return len(faiss.serialize_index(index))
+
+def search_latency(index, queries, k):
+    # One query at a time, like the chat app
+    latencies = []
+    results = []
+    for query in queries:
+        start = time.perf_counter()
+        _, ids = index.search(query[None, :], k)
+        latencies.append(time.perf_counter() - start)
+        results.append(ids[0])
+    return np.array(latencies) * 1000, np.array(results)
+
+def recall_at_k(exact_ids, ann_ids):
+    hits = [len(set(e[e >= 0]) & set(a[a >= 0])) / max(1, (e >= 0).sum()) for e, a in zip(exact_ids, ann_ids)]
+    return float(np.mean(hits))
+
+def text_storage(texts):
+    # (raw, zlib-compressed) bytes, compressing each chunk on its own like mmap_store does
+    raw = sum(len(text.encode('utf-8')) for text in texts)
+    compressed = sum(len(zlib.compress(text.encode('utf-8'), 9)) for text in texts)
+    return raw, compressed
+
+def benchmark_configs(index_type, sweep):
+    # Search-time settings to try for each index type
+    if index_type in ("ivf_flat", "ivf_pq"):
+        return [dict(DEFAULT_PARAMS, nprobe=n) for n in sweep.get("nprobe", [1, 4, 8, 16, 32])]
+    if index_type == "hnsw":
+        return [dict(DEFAULT_PARAMS, ef_search=ef) for ef in sweep.get("ef_search", [16, 32, 64, 128])]
+    return [dict(DEFAULT_PARAMS)]
+
+def run(vectors, queries, k, index_types, build_params=None, sweep=None):
+    build_params = dict(DEFAULT_PARAMS, **(build_params or {}))
+    exact = build_index(vectors, "flat", build_params)
+    _, exact_ids = search_latency(exact, queries, k)
+    exact_bytes = index_bytes(exact)
+    print(f"{len(vectors)} vectors, {len(queries)} queries, k={k}")
+    print(f"{'index':<10} {'setting':<14} {'recall@k':>9} {'p50 ms':>8} {'p95 ms':>8} {'size MB':>8} {'% flat':>7} {'build s':>8}")
+    for index_type in index_types:
+        start = time.perf_counter()
+        index = build_index(vectors, index_type, build_params)
+        build_time = time.perf_counter() - start
+        size = index_bytes(index)
+        for params in benchmark_configs(index_type, sweep or {}):
+            set_search_params(index, params)
+            latencies, ids = search_latency(index, queries, k)
+            setting = {"ivf_flat": f"nprobe={params['nprobe']}", "ivf_pq": f"nprobe={params['nprobe']}",
+                       "hnsw": f"ef={params['ef_search']}"}.get(index_type, "-")
+            p50, p95 = np.percentile(latencies, [50, 95])
+            print(f"{index_type:<10} {setting:<14} {recall_at_k(exact_ids, ids):>9.3f} {p50:>8.3f} {p95:>8.3f} "
+                  f"{size / 2**20:>8.2f} {100 * size / exact_bytes:>7.1f} {build_time:>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recall/latency/memory benchmark of FAISS index types")
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--queries", type=int, default=500, help="stored chunk vectors to use as extra queries")
+    parser.add_argument("--types", nargs="+", choices=INDEX_TYPES, default=list(INDEX_TYPES))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    embedding_model = get_embedding_model()
+    db = load_existing_vectorstore(DB_FAISS_PATH, embedding_model, load_manifest(DB_FAISS_PATH))
+    if db is None:
+        raise SystemExit("No vectorstore found; run database.py first")
+    vectors = flat_vectors(db.index)
+    rng = np.random.default_rng(args.seed)
+    sampled = vectors[rng.choice(len(vectors), min(args.queries, len(vectors)), replace=False)]
+    prompts = np.asarray(embedding_model.embed_documents(canned_prompts()), dtype=np.float32)
+    run(vectors, np.vstack([prompts, sampled]), args.k, args.types)
+    raw, compressed = text_storage([doc.page_content for doc in db.docstore._dict.values()])
+    print(f"chunk texts: {raw / 2**20:.2f} MB raw, {compressed / 2**20:.2f} MB with --compress-texts "
+          f"({100 * compressed / max(raw, 1):.1f}%)")
@@ -0,0 +1,159 @@
+import hashlib
+import os
+import re
+import zlib
+import numpy as np
+
+# Duplicate chunk detection for ingestion. Exact duplicates are caught by a hash of
+# the normalized text, near-duplicates (boilerplate, the same monograph from two
+# sources) by MinHash signatures over word shingles with LSH banding: chunks sharing
+# any band are candidates, and a candidate counts as a duplicate when the estimated
+# Jaccard similarity of their shingle sets is at least `threshold`.
+#
+# The signatures of all indexed chunks are saved next to the index as dedup.npz, so
+# incremental builds also catch duplicates of chunks from unchanged PDFs. An index
+# without that file gets its signatures computed from the docstore.
+
+DEDUP_NAME = "dedup.npz"
+THRESHOLD = float(os.getenv("MEDIBOT_DEDUP_THRESHOLD", "0.8"))
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+BANDS = 32
+PRIME = (1 << 31) - 1
+
+_word = re.compile(r"\w+")
+
+
+def normalize_text(text):
+    return " ".join(_word.findall(text.lower()))
+
+def text_hash(text):
+    return hashlib.sha1(normalize_text(text).encode('utf-8')).hexdigest()
+
+def shingle_hashes(text, size=SHINGLE_SIZE):
+    words = normalize_text(text).split()
+    shingles = [" ".join(words[i:i + size]) for i in range(max(1, len(words) - size + 1))]
+    return np.array([zlib.crc32(s.encode('utf-8')) for s in shingles if s], dtype=np.uint64)
+
+
+class MinHasher:
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, PRIME, num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, PRIME, num_perm, dtype=np.uint64)
+
+    def signature(self, text):
+        # None for texts without words; those are only deduplicated exactly
+        x = shingle_hashes(text) % PRIME
+        if not len(x):
+            return None
+        return ((self.a[:, None] * x[None, :] + self.b[:, None]) % PRIME).min(axis=1).astype(np.uint32)
+
+
+class ChunkDeduper:
+    """Tracks the chunks in the index and tells whether a new one duplicates any."""
+
+    def __init__(self, threshold=THRESHOLD, num_perm=NUM_PERM, bands=BANDS):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm)
+        self.ids = []
+        self.hashes = []
+        self.signatures = []
+        self.alive = []
+        self.exact = {}
+        self.buckets = {}
+        self.positions = {}
+
+    def _band_keys(self, signature):
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+
+    def _register(self, chunk_id, digest, signature):
+        pos = len(self.ids)
+        self.ids.append(chunk_id)
+        self.hashes.append(digest)
+        self.signatures.append(signature)
+        self.alive.append(True)
+        self.positions[chunk_id] = pos
+        self.exact.setdefault(digest, pos)
+        if signature is not None:
+            for key in self._band_keys(signature):
+                self.buckets.setdefault(key, []).append(pos)
+
+    def find(self, text):
+        """Return (id of the chunk `text` duplicates or None, hash, signature)."""
+        digest = text_hash(text)
+        pos = self.exact.get(digest)
+        if pos is not None and self.alive[pos]:
+            return self.ids[pos], digest, None
+        signature = self.hasher.signature(text)
+        if signature is not None:
+            seen = set()
+            for key in self._band_keys(signature):
+                for pos in self.buckets.get(key, ()):
+                    if pos in seen or not self.alive[pos]:
+                        continue
+                    seen.add(pos)
+                    if np.mean(self.signatures[pos] == signature) >= self.threshold:
+                        return self.ids[pos], digest, signature
+        return None, digest, signature
+
+    def add(self, chunk_id, text):
+        """Register `text` unless it duplicates a known chunk; returns the duplicated id or None."""
+        duplicate_of, digest, signature = self.find(text)
+        if duplicate_of is None:
+            self._register(chunk_id, digest, signature)
+        return duplicate_of
+
+    def remove(self, chunk_ids):
+        for chunk_id in chunk_ids:
+            pos = self.positions.pop(chunk_id, None)
+            if pos is None:
+                continue
+            self.alive[pos] = False
+            if self.exact.get(self.hashes[pos]) == pos:
+                del self.exact[self.hashes[pos]]
+
+    def save(self, db_path):
+        live = [pos for pos, alive in enumerate(self.alive) if alive]
+        signatures = np.zeros((len(live), self.bands * self.rows), dtype=np.uint32)
+        has_signature = np.zeros(len(live), dtype=bool)
+        for row, pos in enumerate(live):
+            if self.signatures[pos] is not None:
+                signatures[row] = self.signatures[pos]
+                has_signature[row] = True
+        path = os.path.join(db_path, DEDUP_NAME)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, ids=np.array([self.ids[pos] for pos in live], dtype=str),
+                     hashes=np.array([self.hashes[pos] for pos in live], dtype=str),
+                     signatures=signatures, has_signature=has_signature)
+        os.replace(tmp_path, path)
+
+    def register(self, chunk_id, text):
+        """Record a chunk that is already in the index, even if it duplicates another."""
+        self._register(chunk_id, text_hash(text), self.hasher.signature(text))
+
+    @classmethod
+    def from_chunks(cls, chunks, threshold=THRESHOLD):
+        # `chunks` yields (id, text) of every chunk in the index
+        deduper = cls(threshold)
+        for chunk_id, text in chunks:
+            deduper.register(chunk_id, text)
+        return deduper
+
+    @classmethod
+    def load(cls, db_path, threshold=THRESHOLD):
+        # None if the index has no saved signatures, or ones computed with other settings
+        deduper = cls(threshold)
+        path = os.path.join(db_path, DEDUP_NAME)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            if data["signatures"].shape[1] != deduper.bands * deduper.rows:
+                return None
+            for chunk_id, digest, signature, has_signature in zip(
+                    data["ids"].tolist(), data["hashes"].tolist(), data["signatures"], data["has_signature"]):
+                deduper._register(chunk_id, digest, signature if has_signature else None)
+        return deduper
@@ -0,0 +1,65 @@
+import asyncio
+import json
+from functools import partial
+from typing import Iterator
+from langchain_core.language_models.llms import LLM
+from langchain_core.outputs import GenerationChunk
+from bedrock_client import REGION, get_bedrock_client, get_bedrock_executor
+
+# --------------------------
+# Claude LLM via Bedrock
+# --------------------------
+class ClaudeLLM(LLM):
+    model_id: str = "anthropic.claude-3-sonnet-20240229-v1:0"
+    region_name: str = REGION  # MEDIBOT_BEDROCK_REGION
+    temperature: float = 0.5
+    max_tokens: int = 1000
+
+    def _request_body(self, prompt: str) -> str:
+        body = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature
+        }
+        return json.dumps(body)
+
+    def _call(self, prompt: str, **kwargs) -> str:
+        client = get_bedrock_client(self.region_name)
+        response = client.invoke_model(
+            modelId=self.model_id,
+            contentType="application/json",
+            accept="application/json",
+            body=self._request_body(prompt)
+        )
+        result = json.loads(response["body"].read().decode())
+        return result["content"][0]["text"].strip()
+
+    async def _acall(self, prompt: str, stop=None, run_manager=None, **kwargs) -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_bedrock_executor(), partial(self._call, prompt))
+
+    def _stream(self, prompt: str, stop=None, run_manager=None, **kwargs) -> Iterator[GenerationChunk]:
+        # Yields text deltas as Bedrock generates them instead of waiting for the full answer
+        client = get_bedrock_client(self.region_name)
+        response = client.invoke_model_with_response_stream(
+            modelId=self.model_id,
+            contentType="application/json",
+            accept="application/json",
+            body=self._request_body(prompt)
+        )
+        for event in response["body"]:
+            chunk = event.get("chunk")
+            if chunk is None:
+                continue
+            data = json.loads(chunk["bytes"].decode())
+            if data.get("type") != "content_block_delta" or data["delta"].get("type") != "text_delta":
+                continue
+            generation = GenerationChunk(text=data["delta"]["text"])
+            if run_manager:
+                run_manager.on_llm_new_token(generation.text, chunk=generation)
+            yield generation
+
+    @property
+    def _llm_type(self) -> str:
+        return "bedrock-claude"
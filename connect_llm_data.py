@@ -1,19 +1,15 @@
 
-from transformers import pipeline
 from langchain_core.prompts import PromptTemplate
-from langchain_community.vectorstores import FAISS
-from langchain_huggingface import HuggingFaceEmbeddings
+from faiss_index import load_vectorstore
+from embeddings import get_embedding_model
+from snapshots import serving_path
+from llm_backends import create_llm
 import os
 
 DB_FAISS_PATH = "vectorstore/db_faiss"
 
-# Load the HF model using transformers
-llm_pipeline = pipeline(
-    "text-generation",
-    model="mistralai/Mistral-7B-Instruct-v0.3",
-    torch_dtype="auto",
-    device_map="auto"
-)
+# Load the LLM backend (local Mistral-7B unless MEDIBOT_LLM_BACKEND says otherwise)
+llm = create_llm(os.getenv("MEDIBOT_LLM_BACKEND", "mistral"))
 
 # Prompt template
 CUSTOM_PROMPT_TEMPLATE = """
@@ -31,8 +27,8 @@ def set_custom_prompt(template):
     return PromptTemplate(template=template, input_variables=["context", "question"])
 
 # Load FAISS vectorstore and embedding model
-embedding_model = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
-db = FAISS.load_local(DB_FAISS_PATH, embedding_model, allow_dangerous_deserialization=True)
+embedding_model = get_embedding_model()
+db = load_vectorstore(serving_path(DB_FAISS_PATH), embedding_model)
 
 # Main query function
 def query_llm(prompt: str) -> str:
@@ -45,7 +41,7 @@ def query_llm(prompt: str) -> str:
         formatted_prompt = CUSTOM_PROMPT_TEMPLATE.format(context=context, question=prompt)
 
         # Generate response
-        result = llm_pipeline(formatted_prompt, max_new_tokens=256, do_sample=True)[0]["generated_text"]
-        return result.replace(formatted_prompt, "").strip()
+        result = llm.invoke(formatted_prompt)
+        return result.strip()
     except Exception as e:
         return f"⚠️ Error during query: {e}"
@@ -1,39 +1,124 @@
-
-from langchain_community.document_loaders import PyPDFLoader, DirectoryLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_huggingface import HuggingFaceEmbeddings
+import os
+import argparse
 from langchain_community.vectorstores import FAISS
+from index_manifest import (load_manifest, save_manifest, diff_files,
+                            stale_chunk_ids, dependent_files, empty_manifest, index_version)
+from ingest import iter_chunk_batches, BATCH_SIZE
+from embeddings import get_embedding_model
+from faiss_index import INDEX_TYPES, DEFAULT_PARAMS, FLAT_INDEX_NAME, save_vectorstore, load_index_config
+from snapshots import publish_snapshot, current_snapshot
+from chunk_dedup import ChunkDeduper, DEDUP_NAME
 
 
 DATA_PATH="data/"
-def load_pdf_files(data):
-    loader = DirectoryLoader(data,
-                             glob='*.pdf',
-                             loader_cls=PyPDFLoader)
-    
-    documents=loader.load()
-    return documents
-documents=load_pdf_files(data=DATA_PATH)
-#print("Length of PDF pages: ", len(documents))
-def create_chunks(extracted_data):
-    text_splitter=RecursiveCharacterTextSplitter(chunk_size=500,
-                                                 chunk_overlap=50)
-    text_chunks=text_splitter.split_documents(extracted_data)
-    return text_chunks
-
-text_chunks=create_chunks(extracted_data=documents)
-print(f"Total chunks created: {len(text_chunks)}")
-print(" Sample chunk preview:")
-print(text_chunks[0].page_content[:300])  # Show first 300 characters of first chunk
-def get_embedding_model():
-    embedding_model=HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
-    return embedding_model
-
-embedding_model=get_embedding_model()
-sample_embedding = embedding_model.embed_documents([text_chunks[0].page_content])
-print(f"Sample embedding length: {len(sample_embedding[0])}")
+DB_FAISS_PATH = "vectorstore/db_faiss"
+# Leave out chunks that duplicate or nearly duplicate an indexed one (see chunk_dedup.py)
+DEDUP = os.getenv("MEDIBOT_DEDUP", "1") == "1"
 
+def load_existing_vectorstore(db_path, embedding_model, manifest):
+    # Only reuse an index whose chunks are tracked by the manifest; an index built
+    # without one can't be updated in place, so it gets rebuilt from scratch
+    if not manifest["files"] or not os.path.exists(os.path.join(db_path, "index.faiss")):
+        return None
+    return FAISS.load_local(db_path, embedding_model, FLAT_INDEX_NAME, allow_dangerous_deserialization=True)
 
-DB_FAISS_PATH = "vectorstore/db_faiss"
-db = FAISS.from_documents(text_chunks, embedding_model)
-db.save_local(DB_FAISS_PATH)
+def update_vectorstore(data_path, db_path, embedding_model, batch_size=BATCH_SIZE, max_workers=None,
+                       index_type=None, index_params=None, dedup=DEDUP):
+    # Settings that aren't given keep the values the index was last built with
+    saved_config = load_index_config(db_path)
+    index_type = index_type or saved_config["type"]
+    index_params = dict(saved_config["params"], **(index_params or {}))
+    manifest = load_manifest(db_path)
+    db = load_existing_vectorstore(db_path, embedding_model, manifest)
+    if db is None:
+        manifest = empty_manifest()
+    changed, removed = diff_files(data_path, manifest)
+    # Unchanged PDFs whose duplicate chunks point into changed ones are re-ingested too
+    dependents = dependent_files(manifest, list(changed) + removed)
+    changed.update(dependents)
+    print(f"PDFs changed: {len(changed)}, removed: {len(removed)}, re-ingested for duplicates: {len(dependents)}")
+    if not changed and not removed:
+        # Content is unchanged, but the served index may need rebuilding with new settings
+        if db is not None and saved_config != {"type": index_type, "params": index_params}:
+            save_vectorstore(db, db_path, index_type, index_params)
+            print(f"Rebuilt {index_type} index.")
+        else:
+            print("Vectorstore is up to date.")
+        return db
+
+    # Drop vectors of deleted PDFs and of the old version of modified PDFs
+    stale_ids = stale_chunk_ids(manifest, list(changed) + removed)
+    if db is not None and stale_ids:
+        db.delete(stale_ids)
+    deduper = None
+    if dedup:
+        deduper = ChunkDeduper.load(db_path) if db is not None else ChunkDeduper()
+        if deduper is None:
+            # Index built before dedup or with --no-dedup: start from the chunks it holds
+            deduper = ChunkDeduper.from_chunks((doc_id, db.docstore.search(doc_id).page_content)
+                                               for doc_id in db.index_to_docstore_id.values())
+        deduper.remove(stale_ids)
+    for rel_path in removed:
+        del manifest["files"][rel_path]
+
+    # Chunks stream in from the parser pool; each batch is embedded and added to
+    # the index before the next one is pulled
+    total_chunks = 0
+    for batch in iter_chunk_batches(data_path, changed, batch_size=batch_size, max_workers=max_workers,
+                                    deduper=deduper):
+        if batch.documents:
+            if db is None:
+                db = FAISS.from_documents(batch.documents, embedding_model, ids=batch.ids)
+            else:
+                db.add_documents(batch.documents, ids=batch.ids)
+            total_chunks += len(batch.documents)
+        manifest["files"].update(batch.completed)
+    print(f"Total chunks created: {total_chunks}")
+    if dedup:
+        n_duplicates = sum(len(manifest["files"][rel_path].get("duplicates", {})) for rel_path in changed)
+        print(f"Duplicate chunks left out: {n_duplicates}")
+
+    if db is not None:
+        save_vectorstore(db, db_path, index_type, index_params)
+    # Without dedup the saved signatures would go stale, so they are dropped
+    if deduper is not None:
+        os.makedirs(db_path, exist_ok=True)
+        deduper.save(db_path)
+    elif os.path.exists(os.path.join(db_path, DEDUP_NAME)):
+        os.remove(os.path.join(db_path, DEDUP_NAME))
+    save_manifest(db_path, manifest)
+    return db
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or update the MediBot vectorstore")
+    parser.add_argument("--index-type", choices=INDEX_TYPES,
+                        help="index used to serve queries (default: the one last built, else flat); "
+                             "the exact flat index is always kept for updates")
+    parser.add_argument("--nlist", type=int, help="IVF cells (default ~4*sqrt(#chunks))")
+    parser.add_argument("--nprobe", type=int, help="IVF cells visited per query")
+    parser.add_argument("--pq-m", type=int, help="IVF-PQ sub-vectors per vector")
+    parser.add_argument("--hnsw-m", type=int, help="HNSW links per node")
+    parser.add_argument("--ef-search", type=int, help="HNSW candidates per query")
+    parser.add_argument("--compress-texts", action=argparse.BooleanOptionalAction,
+                        help="zlib-compress chunk texts in the served index (default: as last built)")
+    parser.add_argument("--no-dedup", action="store_true", help="index duplicate chunks too")
+    parser.add_argument("--warm", action="store_true", help="precompute the Quick Topics answers afterwards")
+    parser.add_argument("--no-publish", action="store_true", help="don't publish the result as a new serving snapshot")
+    args = parser.parse_args()
+    index_params = {key: value for key, value in vars(args).items() if key in DEFAULT_PARAMS and value is not None}
+
+    embedding_model=get_embedding_model()
+    version = index_version(DB_FAISS_PATH)
+    db = update_vectorstore(DATA_PATH, DB_FAISS_PATH, embedding_model,
+                            index_type=args.index_type, index_params=index_params,
+                            dedup=DEDUP and not args.no_dedup)
+    # Also precompute the Quick Topics answers
+    if args.warm and db is not None:
+        from warmup import warm_quick_answers
+        warm_quick_answers(db, DB_FAISS_PATH)
+    # Running apps switch to the new snapshot on their next poll; nothing is published
+    # when the index wasn't rewritten, unless no snapshot exists yet
+    written = index_version(DB_FAISS_PATH) != version or current_snapshot() is None
+    if not args.no_publish and db is not None and written:
+        print(f"Published snapshot {publish_snapshot(DB_FAISS_PATH)}")
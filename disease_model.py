@@ -0,0 +1,72 @@
+import json
+import os
+import time
+from collections import namedtuple
+import joblib
+import sklearn
+from symptom_index import SymptomIndex
+
+# Versioned on-disk artifact for the disease-prediction model. Each training run
+# writes models/disease_model/v<N>/ with the fitted classifier, the symptom
+# vocabulary (feature order), the label order, the evaluation score and the
+# disease/symptom index, and then points LATEST at it.
+
+MODEL_DIR = "models/disease_model"
+LATEST_NAME = "LATEST"
+
+DiseaseModel = namedtuple("DiseaseModel", ["classifier", "symptoms", "labels", "score", "version", "symptom_index"])
+
+
+def _latest_path(model_dir):
+    return os.path.join(model_dir, LATEST_NAME)
+
+def latest_version(model_dir=MODEL_DIR):
+    path = _latest_path(model_dir)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return f.read().strip()
+
+def _next_version(model_dir):
+    versions = [int(name[1:]) for name in os.listdir(model_dir) if name.startswith('v') and name[1:].isdigit()]
+    return f"v{max(versions, default=0) + 1}"
+
+def save_model(classifier, symptoms, score, model_dir=MODEL_DIR, symptom_index=None, extra=None):
+    """Write a new model version and make it the latest; returns the version name."""
+    os.makedirs(model_dir, exist_ok=True)
+    version = _next_version(model_dir)
+    tmp_dir = os.path.join(model_dir, f".{version}.tmp")
+    os.makedirs(tmp_dir)
+    # Uncompressed so the coefficient arrays can be memory-mapped on load
+    joblib.dump(classifier, os.path.join(tmp_dir, "model.joblib"))
+    if symptom_index is not None:
+        symptom_index.save(os.path.join(tmp_dir, "symptom_index.npz"))
+    meta = {
+        "version": version,
+        "symptoms": list(symptoms),
+        "labels": [str(label) for label in classifier.classes_],
+        "score": float(score),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sklearn_version": sklearn.__version__,
+    }
+    meta.update(extra or {})
+    with open(os.path.join(tmp_dir, "meta.json"), 'w') as f:
+        json.dump(meta, f)
+    os.rename(tmp_dir, os.path.join(model_dir, version))
+    tmp_latest = _latest_path(model_dir) + ".tmp"
+    with open(tmp_latest, 'w') as f:
+        f.write(version)
+    os.replace(tmp_latest, _latest_path(model_dir))
+    return version
+
+def load_model(model_dir=MODEL_DIR, version=None):
+    version = version or latest_version(model_dir)
+    if version is None:
+        raise FileNotFoundError(f"No trained disease model in {model_dir}; run train_disease_model.py first")
+    path = os.path.join(model_dir, version)
+    with open(os.path.join(path, "meta.json"), 'r') as f:
+        meta = json.load(f)
+    classifier = joblib.load(os.path.join(path, "model.joblib"), mmap_mode='r')
+    index_path = os.path.join(path, "symptom_index.npz")
+    symptom_index = SymptomIndex.load(index_path) if os.path.exists(index_path) else None
+    return DiseaseModel(classifier, meta["symptoms"], meta["labels"], meta["score"], version, symptom_index)
@@ -0,0 +1,46 @@
+import numpy as np
+
+# Top-k disease ranking for one or many users at once. The classifier picks the k
+# most probable diseases; these are then re-ordered by the share of the user's
+# symptoms each disease lists, (matched + 1) / (selected + 1) * model score, with
+# all match counts coming from one product against the disease x symptom matrix.
+
+
+class DiseaseRanker:
+    def __init__(self, classifier, symptom_index, score=1.0):
+        self.classifier = classifier
+        self.classes = [str(label) for label in classifier.classes_]
+        self.score = score
+        # Index rows re-ordered to follow classifier.classes_
+        rows = {disease: i for i, disease in enumerate(symptom_index.diseases)}
+        self.matrix = symptom_index.matrix[[rows[disease] for disease in self.classes]].astype(np.float32)
+        self.symptom_pos = symptom_index.symptom_pos
+
+    def vectorize(self, symptom_lists):
+        # (n users, n symptoms) binary matrix from lists of dataset symptoms
+        X = np.zeros((len(symptom_lists), len(self.symptom_pos)), dtype=np.float32)
+        for row, symptoms in enumerate(symptom_lists):
+            X[row, [self.symptom_pos[sym] for sym in symptoms]] = 1
+        return X
+
+    def rank(self, X, k=10):
+        """Return (indices, scores), both (n users, k): class indices into
+        `classes` ordered best first, and their match scores."""
+        X = np.atleast_2d(np.asarray(X, dtype=np.float32))
+        proba = self.classifier.predict_proba(X)
+        k = min(k, proba.shape[1])
+        top = np.argpartition(-proba, k - 1, axis=1)[:, :k]
+        matches = X @ self.matrix.T
+        selected = X.sum(axis=1, keepdims=True)
+        scores = (matches + 1) / (selected + 1) * self.score
+        rows = np.arange(len(X))[:, None]
+        top_scores = scores[rows, top]
+        # Highest match score first, ties broken by higher probability
+        order = np.lexsort((-proba[rows, top], -top_scores), axis=-1)
+        return top[rows, order], top_scores[rows, order]
+
+    def rank_symptoms(self, symptom_lists, k=10):
+        # [(disease, score), ...] per user
+        indices, scores = self.rank(self.vectorize(symptom_lists), k)
+        return [[(self.classes[i], float(s)) for i, s in zip(idx_row, score_row)]
+                for idx_row, score_row in zip(indices, scores)]
@@ -0,0 +1,186 @@
+import atexit
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# Embedding service shared by the index builder and the chat apps.
+# Document vectors are cached on disk keyed by (model name, chunk text hash), so
+# rebuilding the index or re-chunking only embeds text that was never seen before.
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+BATCH_SIZE = int(os.getenv("MEDIBOT_EMBED_BATCH_SIZE", "64"))
+NUM_WORKERS = int(os.getenv("MEDIBOT_EMBED_WORKERS", "1"))
+CACHE_DIR = os.getenv("MEDIBOT_EMBED_CACHE_DIR", "vectorstore/embedding_cache")
+
+
+def text_key(model_name, text):
+    return hashlib.sha256((model_name + "\0" + text).encode('utf-8')).hexdigest()
+
+
+class EmbeddingCache:
+    """Append-only vector store: `vectors.f32` holds raw float32 rows and is read
+    through a memory map, `keys.txt` holds one key per row in the same order.
+
+    Loading and appending hold an exclusive lock on `cache.lock`, so several
+    processes can share the cache and a load never sees half of an append.
+    """
+
+    def __init__(self, cache_dir, model_name):
+        self.dir = os.path.join(cache_dir, model_name.replace('/', '__'))
+        self.keys_path = os.path.join(self.dir, "keys.txt")
+        self.vectors_path = os.path.join(self.dir, "vectors.f32")
+        self.meta_path = os.path.join(self.dir, "meta.json")
+        self.lock_path = os.path.join(self.dir, "cache.lock")
+        self.lock = threading.Lock()
+        self.dim = None
+        self.rows = {}
+        self.vectors = None
+        with self._locked():
+            self._load()
+
+    @contextmanager
+    def _locked(self):
+        with self.lock:
+            os.makedirs(self.dir, exist_ok=True)
+            with open(self.lock_path, 'a') as f:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                yield
+
+    def _stale(self):
+        # Another process appended since we last loaded
+        if self.dim is None:
+            return os.path.exists(self.meta_path)
+        size = os.path.getsize(self.vectors_path) if os.path.exists(self.vectors_path) else 0
+        return size != 4 * self.dim * len(self.rows)
+
+    def _load(self):
+        # Call with the lock held
+        if not os.path.exists(self.meta_path):
+            return
+        with open(self.meta_path, 'r') as f:
+            self.dim = json.load(f)["dim"]
+        lines = [""]
+        if os.path.exists(self.keys_path):
+            with open(self.keys_path, 'r') as f:
+                lines = f.read().split("\n")
+        n_vectors = os.path.getsize(self.vectors_path) // (4 * self.dim) if os.path.exists(self.vectors_path) else 0
+        # The last element is "" or a key cut off mid-write
+        keys = lines[:-1][:n_vectors]
+        # A crash between the two appends can leave vectors without keys (or the
+        # reverse); cut both files back to the rows they agree on so later appends
+        # line up again
+        if lines[-1] or len(lines) - 1 > len(keys):
+            with open(self.keys_path, 'w') as f:
+                f.writelines(key + "\n" for key in keys)
+        if os.path.exists(self.vectors_path) and os.path.getsize(self.vectors_path) != 4 * self.dim * len(keys):
+            with open(self.vectors_path, 'r+b') as f:
+                f.truncate(4 * self.dim * len(keys))
+        self.rows = {key: row for row, key in enumerate(keys)}
+        self._map(len(keys))
+
+    def _map(self, n_rows):
+        if n_rows:
+            self.vectors = np.memmap(self.vectors_path, dtype=np.float32, mode='r', shape=(n_rows, self.dim))
+
+    def get_many(self, keys):
+        # Returns {key: vector} for the keys that are cached
+        with self.lock:
+            return {key: np.array(self.vectors[self.rows[key]]) for key in keys if key in self.rows}
+
+    def put_many(self, keys, vectors):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        with self._locked():
+            if self._stale():
+                self._load()
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                with open(self.meta_path, 'w') as f:
+                    json.dump({"dim": self.dim}, f)
+            new = [i for i, key in enumerate(keys) if key not in self.rows]
+            if not new:
+                return
+            # Vectors are written before keys so a key never points past the data
+            with open(self.vectors_path, 'ab') as f:
+                f.write(vectors[new].tobytes())
+            with open(self.keys_path, 'a') as f:
+                for i in new:
+                    self.rows[keys[i]] = len(self.rows)
+                    f.write(keys[i] + "\n")
+            self._map(len(self.rows))
+
+
+class CachedEmbeddings(Embeddings):
+    """Sentence-transformer embeddings with batching, optional CPU worker processes
+    and an on-disk cache for document vectors.
+
+    Produces the same vectors as HuggingFaceEmbeddings with default settings.
+    """
+
+    def __init__(self, model_name=MODEL_NAME, batch_size=BATCH_SIZE, num_workers=NUM_WORKERS,
+                 cache_dir=CACHE_DIR):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.num_workers = num_workers
+        # Imported here so EmbeddingCache can be used without the model stack
+        from sentence_transformers import SentenceTransformer
+        self.client = SentenceTransformer(model_name)
+        # Opened on the first embed_documents call; processes that only embed
+        # queries never touch the shared cache files
+        self.cache_dir = cache_dir
+        self.cache = None
+        self.pool = None
+
+    def _get_pool(self):
+        if self.pool is None:
+            self.pool = self.client.start_multi_process_pool(target_devices=['cpu'] * self.num_workers)
+            atexit.register(self.close)
+        return self.pool
+
+    def close(self):
+        if self.pool is not None:
+            self.client.stop_multi_process_pool(self.pool)
+            self.pool = None
+
+    def _encode(self, texts):
+        texts = [text.replace("\n", " ") for text in texts]
+        # Worker processes only pay off once every worker gets a few batches
+        if self.num_workers > 1 and len(texts) >= 2 * self.batch_size * self.num_workers:
+            return self.client.encode_multi_process(texts, self._get_pool(), batch_size=self.batch_size)
+        return self.client.encode(texts, batch_size=self.batch_size)
+
+    def _get_cache(self):
+        if self.cache is None and self.cache_dir:
+            self.cache = EmbeddingCache(self.cache_dir, self.model_name)
+        return self.cache
+
+    def embed_documents(self, texts):
+        if self._get_cache() is None:
+            return self._encode(texts).tolist()
+        keys = [text_key(self.model_name, text) for text in texts]
+        found = self.cache.get_many(keys)
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+        if missing:
+            vectors = self._encode(list(missing.values()))
+            self.cache.put_many(list(missing), vectors)
+            found.update(zip(missing, vectors))
+        return [found[key].tolist() for key in keys]
+
+    def embed_query(self, text):
+        return self._encode([text])[0].tolist()
+
+
+def get_embedding_model(cache_dir=CACHE_DIR):
+    return CachedEmbeddings(cache_dir=cache_dir)
@@ -0,0 +1,161 @@
+import json
+import math
+import os
+import faiss
+import numpy as np
+from langchain_community.vectorstores import FAISS
+from mmap_store import MMAP_DIR_NAME, MmapVectorStore, export_mmap_store
+
+# Index types for the document vectorstore.
+#
+# database.py always maintains the exact flat index ("index.faiss"/"index.pkl"),
+# which supports in-place updates. When an approximate type is configured it is
+# built from the flat index's vectors and saved next to it as "index_ann.*";
+# index_config.json records which one to serve and its search parameters. The
+# served index is also exported to "mmap/" (see mmap_store.py), which is what the
+# apps load by default.
+#
+#   flat      exact brute-force search
+#   ivf_flat  inverted lists over k-means cells; search visits `nprobe` of `nlist` cells
+#   ivf_pq    like ivf_flat with product-quantized vectors (`pq_m` sub-vectors)
+#   hnsw      graph search; `hnsw_m` links per node, `ef_search` candidates per query
+#   sq_fp16   exact search over vectors stored as float16 (half the memory of flat)
+#   sq_int8   exact search over vectors scalar-quantized to 8 bits per dimension (a quarter)
+#
+# `compress_texts` zlib-compresses the chunk texts in the memory-mapped export.
+
+INDEX_TYPES = ("flat", "ivf_flat", "ivf_pq", "hnsw", "sq_fp16", "sq_int8")
+SQ_TYPES = {"sq_fp16": faiss.ScalarQuantizer.QT_fp16, "sq_int8": faiss.ScalarQuantizer.QT_8bit}
+INDEX_CONFIG_NAME = "index_config.json"
+FLAT_INDEX_NAME = "index"
+ANN_INDEX_NAME = "index_ann"
+VECTORSTORE_FORMAT = os.getenv("MEDIBOT_VECTORSTORE_FORMAT", "mmap")  # "mmap" or "pickle"
+
+DEFAULT_PARAMS = {
+    "nlist": None,  # None picks ~4 * sqrt(#vectors)
+    "nprobe": 8,
+    "pq_m": 48,
+    "pq_nbits": 8,
+    "hnsw_m": 32,
+    "ef_construction": 80,
+    "ef_search": 64,
+    "compress_texts": False,
+}
+
+
+def default_nlist(n_vectors):
+    # k-means wants ~39 training points per cell
+    return max(1, min(int(4 * math.sqrt(n_vectors)), n_vectors // 39))
+
+def make_index(index_type, dim, n_vectors, params):
+    if index_type == "flat":
+        return faiss.IndexFlatL2(dim)
+    if index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, params["hnsw_m"])
+        index.hnsw.efConstruction = params["ef_construction"]
+        return index
+    if index_type in SQ_TYPES:
+        # QT_8bit learns per-dimension ranges in train(); QT_fp16 needs no training
+        return faiss.IndexScalarQuantizer(dim, SQ_TYPES[index_type], faiss.METRIC_L2)
+    nlist = params["nlist"] or default_nlist(n_vectors)
+    quantizer = faiss.IndexFlatL2(dim)
+    if index_type == "ivf_flat":
+        return faiss.IndexIVFFlat(quantizer, dim, nlist)
+    if index_type == "ivf_pq":
+        # Each PQ codebook has 2^nbits centroids and needs at least that many points
+        nbits = min(params["pq_nbits"], max(1, int(math.log2(max(n_vectors, 2)))))
+        return faiss.IndexIVFPQ(quantizer, dim, nlist, params["pq_m"], nbits)
+    raise ValueError(f"Unknown index type '{index_type}'. Available: {', '.join(INDEX_TYPES)}")
+
+def set_search_params(index, params):
+    if isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = params["ef_search"]
+        return
+    try:
+        faiss.extract_index_ivf(index).nprobe = params["nprobe"]
+    except RuntimeError:
+        pass  # not an IVF index
+
+def flat_vectors(index):
+    return index.reconstruct_n(0, index.ntotal)
+
+def build_index(vectors, index_type, params, max_train=100000, seed=0):
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    index = make_index(index_type, vectors.shape[1], len(vectors), params)
+    if not index.is_trained:
+        rng = np.random.default_rng(seed)
+        sample = vectors if len(vectors) <= max_train else vectors[rng.choice(len(vectors), max_train, replace=False)]
+        index.train(sample)
+    index.add(vectors)
+    set_search_params(index, params)
+    return index
+
+def build_ann_vectorstore(db, index_type, params):
+    # Same docstore and id mapping as the flat index, different search structure
+    index = build_index(flat_vectors(db.index), index_type, params)
+    return FAISS(embedding_function=db.embedding_function, index=index,
+                 docstore=db.docstore, index_to_docstore_id=db.index_to_docstore_id)
+
+
+# --------------------------
+# Config and loading
+# --------------------------
+def load_index_config(db_path):
+    path = os.path.join(db_path, INDEX_CONFIG_NAME)
+    if not os.path.exists(path):
+        return {"type": "flat", "params": dict(DEFAULT_PARAMS)}
+    with open(path, 'r') as f:
+        config = json.load(f)
+    config["params"] = dict(DEFAULT_PARAMS, **config.get("params", {}))
+    return config
+
+def save_index_config(db_path, index_type, params):
+    path = os.path.join(db_path, INDEX_CONFIG_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({"type": index_type, "params": params}, f, indent=2)
+    os.replace(tmp_path, path)
+
+def save_vectorstore(db, db_path, index_type="flat", params=None):
+    """Save the flat index and, for approximate types, the derived index plus config.
+
+    The index that serves queries is also exported in the memory-mapped format.
+    """
+    params = dict(DEFAULT_PARAMS, **(params or {}))
+    db.save_local(db_path, FLAT_INDEX_NAME)
+    served = db
+    if index_type != "flat":
+        served = build_ann_vectorstore(db, index_type, params)
+        served.save_local(db_path, ANN_INDEX_NAME)
+    else:
+        for ext in (".faiss", ".pkl"):
+            path = os.path.join(db_path, ANN_INDEX_NAME + ext)
+            if os.path.exists(path):
+                os.remove(path)
+    export_mmap_store(served, os.path.join(db_path, MMAP_DIR_NAME), compress_texts=params["compress_texts"])
+    save_index_config(db_path, index_type, params)
+
+def load_vectorstore(db_path, embedding_model, search_params=None):
+    """Load the index that serves queries, with search parameters applied.
+
+    The memory-mapped export is used when present, unless MEDIBOT_VECTORSTORE_FORMAT
+    is "pickle". `search_params` (e.g. {"nprobe": 16}) override the saved ones; so do
+    the MEDIBOT_INDEX_NPROBE and MEDIBOT_INDEX_EF_SEARCH environment variables.
+    """
+    config = load_index_config(db_path)
+    params = config["params"]
+    for key in ("nprobe", "ef_search"):
+        env_value = os.getenv(f"MEDIBOT_INDEX_{key.upper()}")
+        if env_value:
+            params[key] = int(env_value)
+    params.update(search_params or {})
+    mmap_path = os.path.join(db_path, MMAP_DIR_NAME)
+    if VECTORSTORE_FORMAT != "pickle" and os.path.exists(os.path.join(mmap_path, "meta.json")):
+        db = MmapVectorStore(mmap_path, embedding_model)
+        if db.index is not None:
+            set_search_params(db.index, params)
+        return db
+    index_name = FLAT_INDEX_NAME if config["type"] == "flat" else ANN_INDEX_NAME
+    db = FAISS.load_local(db_path, embedding_model, index_name, allow_dangerous_deserialization=True)
+    set_search_params(db.index, params)
+    return db
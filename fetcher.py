@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Shared fetch layer for the scraping scripts (synonym lexicon, disease infoboxes,
+# disease list): one connection-pooled session, bounded concurrency, a request
+# rate limit per host, retries with backoff and an on-disk response cache, so
+# reruns only hit the network for pages that were never fetched.
+
+CACHE_DIR = os.getenv("MEDIBOT_HTTP_CACHE_DIR", ".http_cache")
+MAX_WORKERS = int(os.getenv("MEDIBOT_FETCH_WORKERS", "8"))
+RATE_PER_HOST = float(os.getenv("MEDIBOT_FETCH_RATE", "2"))  # requests per second per host
+HOST_RATES = {"www.google.com": 0.5}  # hosts that need a slower pace
+
+
+class HostRateLimiter:
+    def __init__(self, rate=RATE_PER_HOST, host_rates=None):
+        self.rate = rate
+        self.host_rates = dict(HOST_RATES, **(host_rates or {}))
+        self.next_slot = {}
+        self.lock = threading.Lock()
+
+    def wait(self, host):
+        # Reserve the next free slot for this host, then sleep until it comes
+        interval = 1.0 / self.host_rates.get(host, self.rate)
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class Fetcher:
+    def __init__(self, cache_dir=CACHE_DIR, max_workers=MAX_WORKERS, rate=RATE_PER_HOST, host_rates=None,
+                 retries=3, backoff=0.5, timeout=20):
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.limiter = HostRateLimiter(rate, host_rates)
+        self.session = requests.Session()
+        retry = Retry(total=retries, backoff_factor=backoff, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=["GET"])
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _cache_path(self, kind, key, ext):
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, kind, digest[:2], digest + ext)
+
+    def _write_cache(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def get(self, url, verify=True):
+        """Return the body of `url` as bytes; successful responses are cached on disk."""
+        path = self._cache_path("pages", url, ".html")
+        if self.cache_dir and os.path.exists(path):
+            with open(path, 'rb') as f:
+                return f.read()
+        self.limiter.wait(urlparse(url).netloc)
+        response = self.session.get(url, timeout=self.timeout, verify=verify)
+        if self.cache_dir and response.ok:
+            self._write_cache(path, response.content)
+        return response.content
+
+    def cached_call(self, host, key, func):
+        """Run a rate-limited call that doesn't go through the session (e.g. a search
+        client) and cache its JSON-serializable result under `key`."""
+        path = self._cache_path("calls", key, ".json")
+        if self.cache_dir and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        self.limiter.wait(host)
+        result = func()
+        if self.cache_dir:
+            self._write_cache(path, json.dumps(result).encode('utf-8'))
+        return result
+
+    def map(self, func, items):
+        # func(item) for every item on the worker pool, results in input order
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(func, items))
+
+    def fetch_many(self, urls, verify=True):
+        return self.map(lambda url: self.get(url, verify=verify), urls)
+
+
+_fetcher = None
+_fetcher_lock = threading.Lock()
+
+def get_fetcher():
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            _fetcher = Fetcher()
+        return _fetcher
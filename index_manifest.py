@@ -0,0 +1,117 @@
+import glob
+import hashlib
+import json
+import os
+
+# Manifest that lives next to the FAISS index files and records, for every PDF
+# that went into the index, its content hash and the IDs of the chunks it produced.
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def manifest_path(db_path):
+    return os.path.join(db_path, MANIFEST_NAME)
+
+
+def file_sha256(path, block_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def empty_manifest():
+    return {"version": MANIFEST_VERSION, "files": {}}
+
+
+def load_manifest(db_path):
+    path = manifest_path(db_path)
+    if not os.path.exists(path):
+        return empty_manifest()
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    # An unknown manifest layout is treated as missing, forcing a full rebuild
+    if manifest.get("version") != MANIFEST_VERSION:
+        return empty_manifest()
+    return manifest
+
+
+def save_manifest(db_path, manifest):
+    os.makedirs(db_path, exist_ok=True)
+    path = manifest_path(db_path)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def list_pdf_files(data_path, pattern='*.pdf'):
+    return sorted(glob.glob(os.path.join(data_path, pattern)))
+
+
+def diff_files(data_path, manifest, pattern='*.pdf'):
+    """Compare the PDFs on disk against the manifest.
+
+    Returns (changed, removed): changed maps the relative path of every new or
+    modified PDF to its content hash, removed lists the relative paths that are
+    in the manifest but no longer on disk.
+    """
+    known = manifest["files"]
+    changed = {}
+    seen = set()
+    for path in list_pdf_files(data_path, pattern):
+        rel_path = os.path.relpath(path, data_path)
+        seen.add(rel_path)
+        file_hash = file_sha256(path)
+        entry = known.get(rel_path)
+        if entry is None or entry["sha256"] != file_hash:
+            changed[rel_path] = file_hash
+    removed = sorted(set(known) - seen)
+    return changed, removed
+
+
+def chunk_id(rel_path, file_hash, page, index):
+    # Stable ID: the same file content at the same path always yields the same chunk
+    # IDs, while identical PDFs under different names don't collide
+    prefix = hashlib.sha256((rel_path + "\0" + file_hash).encode('utf-8')).hexdigest()[:16]
+    return f"{prefix}-p{page}-c{index}"
+
+
+def stale_chunk_ids(manifest, rel_paths):
+    ids = []
+    for rel_path in rel_paths:
+        entry = manifest["files"].get(rel_path)
+        if entry is not None:
+            ids.extend(entry["chunk_ids"])
+    return ids
+
+
+def dependent_files(manifest, rel_paths):
+    """Files whose chunks were left out as duplicates of chunks from `rel_paths`.
+
+    Returns {rel_path: sha256}, following chains of duplicates. These files must be
+    re-ingested when `rel_paths` change, or their content would drop out of the index.
+    """
+    rel_paths = set(rel_paths)
+    stale = set(stale_chunk_ids(manifest, rel_paths))
+    found = {}
+    while True:
+        new = {rel_path: entry["sha256"] for rel_path, entry in manifest["files"].items()
+               if rel_path not in rel_paths and rel_path not in found
+               and any(kept in stale for kept in entry.get("duplicates", {}).values())}
+        if not new:
+            return found
+        found.update(new)
+        stale.update(stale_chunk_ids(manifest, new))
+
+
+def index_version(db_path):
+    # Changes whenever the index is rewritten; used to invalidate derived caches
+    stats = []
+    for name in ("index.faiss", MANIFEST_NAME):
+        path = os.path.join(db_path, name)
+        if os.path.exists(path):
+            st = os.stat(path)
+            stats.append(f"{st.st_mtime_ns}:{st.st_size}")
+    return "-".join(stats)
@@ -0,0 +1,95 @@
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from langchain_community.document_loaders import PyPDFLoader
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from index_manifest import chunk_id
+
+# Streaming PDF ingestion: PDFs are parsed and chunked in a process pool and the
+# chunks come back as a generator of fixed-size batches, so only a few files'
+# worth of pages are ever held in memory at once.
+
+CHUNK_SIZE = 500
+CHUNK_OVERLAP = 50
+BATCH_SIZE = int(os.getenv("MEDIBOT_INGEST_BATCH_SIZE", "256"))
+
+# documents/ids: chunks to embed and write; completed: manifest entries of the
+# files whose last chunk is in this batch. With a ChunkDeduper, duplicate chunks are
+# left out and listed in their file's entry as {"duplicates": {id: duplicated id}}.
+IngestBatch = namedtuple("IngestBatch", ["documents", "ids", "completed"])
+
+
+def load_pdf_file(path):
+    loader = PyPDFLoader(path)
+    documents=loader.load()
+    return documents
+
+def create_chunks(extracted_data):
+    text_splitter=RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE,
+                                                 chunk_overlap=CHUNK_OVERLAP)
+    text_chunks=text_splitter.split_documents(extracted_data)
+    return text_chunks
+
+def assign_chunk_ids(text_chunks, rel_path, file_hash):
+    # Number chunks per page so IDs are stable for the same file content
+    ids = []
+    per_page = {}
+    for chunk in text_chunks:
+        page = chunk.metadata.get('page', 0)
+        index = per_page.get(page, 0)
+        per_page[page] = index + 1
+        ids.append(chunk_id(rel_path, file_hash, page, index))
+    return ids
+
+def parse_pdf(data_path, rel_path, file_hash):
+    # Runs inside a worker process
+    documents = load_pdf_file(os.path.join(data_path, rel_path))
+    text_chunks = create_chunks(extracted_data=documents)
+    ids = assign_chunk_ids(text_chunks, rel_path, file_hash)
+    entry = {"sha256": file_hash, "pages": len(documents), "chunk_ids": ids}
+    return rel_path, text_chunks, ids, entry
+
+def iter_parsed_files(data_path, files, max_workers=None):
+    """Yield (rel_path, chunks, ids, entry) for every file in `files` as workers finish.
+
+    At most 2 * max_workers files are in flight, which bounds peak memory.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    pending = set()
+    todo = iter(files.items())
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for rel_path, file_hash in todo:
+            pending.add(executor.submit(parse_pdf, data_path, rel_path, file_hash))
+            if len(pending) >= 2 * max_workers:
+                break
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+                next_file = next(todo, None)
+                if next_file is not None:
+                    pending.add(executor.submit(parse_pdf, data_path, *next_file))
+
+def iter_chunk_batches(data_path, files, batch_size=BATCH_SIZE, max_workers=None, deduper=None):
+    documents, ids, completed = [], [], {}
+    for rel_path, text_chunks, chunk_ids, entry in iter_parsed_files(data_path, files, max_workers):
+        kept_ids, duplicates = [], {}
+        for chunk, cid in zip(text_chunks, chunk_ids):
+            if deduper is not None:
+                duplicate_of = deduper.add(cid, chunk.page_content)
+                if duplicate_of is not None:
+                    duplicates[cid] = duplicate_of
+                    continue
+            kept_ids.append(cid)
+            documents.append(chunk)
+            ids.append(cid)
+            if len(documents) >= batch_size:
+                yield IngestBatch(documents, ids, completed)
+                documents, ids, completed = [], [], {}
+        # Only chunks that are in the index are listed, so they can be deleted later
+        entry["chunk_ids"] = kept_ids
+        if duplicates:
+            entry["duplicates"] = duplicates
+        completed[rel_path] = entry
+    if documents or completed:
+        yield IngestBatch(documents, ids, completed)
@@ -0,0 +1,58 @@
+import json
+import os
+
+# Registry of LLM backends. The backend used by the chat app, the API and the
+# CLIs is picked by config:
+#   MEDIBOT_LLM_BACKEND  backend name (default "bedrock")
+#   MEDIBOT_LLM_OPTIONS  JSON object passed to the backend, e.g.
+#                        '{"latency": 0.2, "tokens_per_second": 50}' for "stub"
+
+LLM_BACKEND = os.getenv("MEDIBOT_LLM_BACKEND", "bedrock")
+LLM_OPTIONS = json.loads(os.getenv("MEDIBOT_LLM_OPTIONS", "{}"))
+
+_backends = {}
+
+
+def register_backend(name):
+    def register(factory):
+        _backends[name] = factory
+        return factory
+    return register
+
+
+def backend_names():
+    return sorted(_backends)
+
+
+def create_llm(name=None, **options):
+    name = name or LLM_BACKEND
+    if name not in _backends:
+        raise ValueError(f"Unknown LLM backend '{name}'. Available: {', '.join(backend_names())}")
+    if not options and name == LLM_BACKEND:
+        options = LLM_OPTIONS
+    return _backends[name](**options)
+
+
+@register_backend("bedrock")
+def bedrock_backend(**options):
+    from claude_llm import ClaudeLLM
+    return ClaudeLLM(**options)
+
+
+@register_backend("stub")
+def stub_backend(**options):
+    from stub_llm import StubLLM
+    return StubLLM(**options)
+
+
+@register_backend("mistral")
+def mistral_backend(model_id="mistralai/Mistral-7B-Instruct-v0.3", max_new_tokens=256, **options):
+    # Local transformers model; imported lazily because it pulls in torch
+    from langchain_huggingface import HuggingFacePipeline
+    return HuggingFacePipeline.from_model_id(
+        model_id=model_id,
+        task="text-generation",
+        device_map="auto",
+        model_kwargs={"torch_dtype": "auto"},
+        pipeline_kwargs={"max_new_tokens": max_new_tokens, "do_sample": True, "return_full_text": False, **options},
+    )
@@ -0,0 +1,65 @@
+import argparse
+import json
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from quick_topics import canned_prompts
+
+# Load test for api.py: sends queries from several client threads and reports
+# latency percentiles and throughput. Run the API with `--llm stub` to measure
+# retrieval, prompt assembly and serving overhead without Bedrock.
+
+
+def post(url, payload, timeout):
+    request = urllib.request.Request(url, data=json.dumps(payload).encode('utf-8'),
+                                     headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+        ok = True
+    except Exception:
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+def run(base_url, queries, n_requests, concurrency, batch_size, timeout):
+    if batch_size > 1:
+        url = base_url + "/query/batch"
+        payloads = [{"queries": [queries[(i * batch_size + j) % len(queries)] for j in range(batch_size)]}
+                    for i in range(n_requests)]
+    else:
+        url = base_url + "/query"
+        payloads = [{"query": queries[i % len(queries)]} for i in range(n_requests)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda payload: post(url, payload, timeout), payloads))
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array([latency for latency, ok in results if ok]) * 1000
+    errors = sum(1 for _, ok in results if not ok)
+    print(f"Requests: {n_requests} (batch size {batch_size}), concurrency: {concurrency}, errors: {errors}")
+    print(f"Throughput: {n_requests / elapsed:.1f} req/s, {n_requests * batch_size / elapsed:.1f} queries/s")
+    if len(latencies):
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        print(f"Latency ms  p50: {p50:.1f}  p95: {p95:.1f}  p99: {p99:.1f}  max: {latencies.max():.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test for the MediBot HTTP API")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=1, help="queries per request; >1 uses /query/batch")
+    parser.add_argument("--queries", help="text file with one query per line (default: Quick Topics prompts)")
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    if args.queries:
+        with open(args.queries, 'r', encoding='utf-8') as f:
+            queries = [line.strip() for line in f if line.strip()]
+    else:
+        queries = canned_prompts()
+    run(args.url.rstrip('/'), queries, args.requests, args.concurrency, args.batch_size, args.timeout)
@@ -0,0 +1,139 @@
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import zlib
+import faiss
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+
+# Pickle-free, read-only vectorstore format for serving. Vectors are memory-mapped,
+# so every worker process shares one page-cached copy, and chunk texts/metadata
+# live in SQLite and are read only for the top-k hits.
+#
+#   meta.json      {"format": 1, "kind": "flat" | "faiss", "dim", "count", "compressed_texts"}
+#   vectors.npy    float32 vectors (kind "flat"), searched exactly with numpy
+#   norms.npy      squared norms of the vectors (kind "flat")
+#   index.faiss    approximate FAISS index (kind "faiss"), memory-mapped when supported
+#   chunks.sqlite  table chunks(pos, id, text, metadata) keyed by vector position;
+#                  text is a zlib-compressed UTF-8 blob when compressed_texts is set
+
+MMAP_DIR_NAME = "mmap"
+STORE_FORMAT = 1
+
+
+def export_mmap_store(db, path, compress_texts=False):
+    """Write a LangChain FAISS vectorstore to `path` in the memory-mapped format."""
+    tmp_path = path + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    index = db.index
+    if isinstance(index, faiss.IndexFlatL2):
+        kind = "flat"
+        vectors = index.reconstruct_n(0, index.ntotal)
+        np.save(os.path.join(tmp_path, "vectors.npy"), vectors)
+        np.save(os.path.join(tmp_path, "norms.npy"), (vectors ** 2).sum(axis=1))
+    else:
+        kind = "faiss"
+        faiss.write_index(index, os.path.join(tmp_path, "index.faiss"))
+
+    conn = sqlite3.connect(os.path.join(tmp_path, "chunks.sqlite"))
+    conn.execute("CREATE TABLE chunks (pos INTEGER PRIMARY KEY, id TEXT NOT NULL, text NOT NULL, metadata TEXT NOT NULL)")
+    rows = []
+    for pos, doc_id in sorted(db.index_to_docstore_id.items()):
+        doc = db.docstore.search(doc_id)
+        text = zlib.compress(doc.page_content.encode('utf-8'), 9) if compress_texts else doc.page_content
+        rows.append((pos, doc_id, text, json.dumps(doc.metadata)))
+    conn.executemany("INSERT INTO chunks VALUES (?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+    with open(os.path.join(tmp_path, "meta.json"), 'w') as f:
+        json.dump({"format": STORE_FORMAT, "kind": kind, "dim": index.d, "count": index.ntotal,
+                   "compressed_texts": bool(compress_texts)}, f)
+    shutil.rmtree(path, ignore_errors=True)
+    os.rename(tmp_path, path)
+
+
+class MmapVectorStore(VectorStore):
+    """Read-only vectorstore over a directory written by export_mmap_store."""
+
+    def __init__(self, path, embedding_function):
+        self.path = path
+        self.embedding_function = embedding_function
+        with open(os.path.join(path, "meta.json"), 'r') as f:
+            self.meta = json.load(f)
+        if self.meta["format"] != STORE_FORMAT:
+            raise ValueError(f"Unsupported vectorstore format in {path}: {self.meta['format']}")
+        self.compressed_texts = self.meta.get("compressed_texts", False)
+        self.index = None
+        if self.meta["kind"] == "flat":
+            self.vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode='r')
+            self.norms = np.load(os.path.join(path, "norms.npy"), mmap_mode='r')
+        else:
+            index_path = os.path.join(path, "index.faiss")
+            try:
+                self.index = faiss.read_index(index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+            except RuntimeError:
+                # Index types faiss can't memory-map are read into memory
+                self.index = faiss.read_index(index_path)
+        self.local = threading.local()
+
+    @property
+    def embeddings(self):
+        return self.embedding_function
+
+    def _conn(self):
+        # One read-only SQLite connection per thread
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            uri = "file:" + os.path.join(self.path, "chunks.sqlite") + "?mode=ro"
+            conn = self.local.conn = sqlite3.connect(uri, uri=True)
+        return conn
+
+    def _search(self, query_vector, k):
+        query = np.asarray(query_vector, dtype=np.float32)
+        if self.index is not None:
+            distances, positions = self.index.search(query[None, :], k)
+            return [(int(p), float(d)) for p, d in zip(positions[0], distances[0]) if p >= 0]
+        k = min(k, len(self.vectors))
+        if k == 0:
+            return []
+        # Squared L2 distance, as IndexFlatL2 reports it
+        distances = self.norms - 2 * (self.vectors @ query) + float(query @ query)
+        top = np.argpartition(distances, k - 1)[:k]
+        top = top[np.argsort(distances[top], kind='stable')]
+        return [(int(p), float(distances[p])) for p in top]
+
+    def _documents(self, positions):
+        if not positions:
+            return {}
+        marks = ",".join("?" * len(positions))
+        rows = self._conn().execute(f"SELECT pos, id, text, metadata FROM chunks WHERE pos IN ({marks})", positions)
+        if self.compressed_texts:
+            rows = [(pos, doc_id, zlib.decompress(text).decode('utf-8'), metadata) for pos, doc_id, text, metadata in rows]
+        return {pos: Document(id=doc_id, page_content=text, metadata=json.loads(metadata))
+                for pos, doc_id, text, metadata in rows}
+
+    def similarity_search_with_score_by_vector(self, embedding, k=4, **kwargs):
+        hits = self._search(embedding, k)
+        docs = self._documents([pos for pos, _ in hits])
+        return [(docs[pos], score) for pos, score in hits if pos in docs]
+
+    def similarity_search_by_vector(self, embedding, k=4, **kwargs):
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k, **kwargs)]
+
+    def similarity_search_with_score(self, query, k=4, **kwargs):
+        return self.similarity_search_with_score_by_vector(self.embedding_function.embed_query(query), k, **kwargs)
+
+    def similarity_search(self, query, k=4, **kwargs):
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    def _select_relevance_score_fn(self):
+        return self._euclidean_relevance_score_fn
+
+    @classmethod
+    def from_texts(cls, texts, embedding, metadatas=None, **kwargs):
+        raise NotImplementedError("MmapVectorStore is read-only; build the index with database.py")
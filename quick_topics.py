@@ -0,0 +1,41 @@
+# --------------------------
+# Tailored Quick Topics
+# --------------------------
+COLD_FLU_PROMPT = "What are the common symptoms of a cold?"
+MEDICATIONS_PROMPT = "What are some commonly used over-the-counter medications?"
+WELLNESS_PROMPT = "Share some daily wellness and self-care habits."
+
+# Medication prompt picked from keywords in the user's earlier messages
+MEDICATION_KEYWORD_MAP = {
+    "allergy": "What OTC medications help with allergies?",
+    "rash": "What OTC treatments are available for skin rashes like poison ivy?",
+    "fever": "What OTC medications can help reduce fever?",
+    "pain": "What are some common pain relievers available over the counter?",
+    "headache": "What are the best OTC medications for headaches?",
+    "cold": "What are good OTC remedies for cold and flu symptoms?",
+    "cough": "What over-the-counter medications relieve coughing?",
+    "itch": "What can relieve itchy skin or insect bites?"
+}
+
+def get_tailored_prompt(topic, messages):
+    if topic == "Cold & Flu":
+        return COLD_FLU_PROMPT
+
+    elif topic == "Medications":
+        if messages:
+            latest_input = " ".join([m['content'] for m in messages if m['role'] == 'user']).lower()
+            for keyword, response in MEDICATION_KEYWORD_MAP.items():
+                if keyword in latest_input:
+                    return response
+            return f"Based on the user's prior message: '{latest_input}', suggest appropriate over-the-counter medications."
+        else:
+            return MEDICATIONS_PROMPT
+
+    elif topic == "Wellness Tips":
+        return WELLNESS_PROMPT
+
+    return ""
+
+def canned_prompts():
+    # Every fixed prompt a Quick Topics button can produce
+    return [COLD_FLU_PROMPT, MEDICATIONS_PROMPT, WELLNESS_PROMPT] + list(MEDICATION_KEYWORD_MAP.values())
@@ -0,0 +1,62 @@
+import threading
+from langchain.chains import RetrievalQA
+from langchain_core.prompts import PromptTemplate
+from llm_backends import create_llm
+
+# --------------------------
+# Prompt Template
+# --------------------------
+CUSTOM_PROMPT_TEMPLATE = """
+Use the pieces of information provided in the context to answer the user's question.
+If you don't know the answer, just say that you don't know — don't make it up.
+Only use information from the provided context.
+
+Context: {context}
+Question: {question}
+
+Start the answer directly. Be concise.
+"""
+def set_custom_prompt(template):
+    return PromptTemplate(template=template, input_variables=["context", "question"])
+
+# --------------------------
+# Process-wide LLM and RetrievalQA chain
+# --------------------------
+_llm = create_llm()
+_chains = {}
+_lock = threading.Lock()
+
+def get_llm():
+    return _llm
+
+def get_qa_chain(vectorstore, prompt_template=CUSTOM_PROMPT_TEMPLATE, k=3, return_source_documents=False):
+    # Built once per settings and shared by every request; rebuilt when a new
+    # vectorstore is swapped in, which also lets the old one be freed
+    key = (prompt_template, k, return_source_documents)
+    with _lock:
+        cached = _chains.get(key)
+        if cached is None or cached[0] is not vectorstore:
+            chain = RetrievalQA.from_chain_type(
+                llm=get_llm(),
+                chain_type="stuff",
+                retriever=vectorstore.as_retriever(search_kwargs={'k': k}),
+                return_source_documents=return_source_documents,
+                chain_type_kwargs={'prompt': set_custom_prompt(prompt_template)}
+            )
+            cached = (vectorstore, chain)
+            _chains[key] = cached
+        return cached[1]
+
+# --------------------------
+# Streaming answers
+# --------------------------
+def format_context(docs):
+    # Same layout the "stuff" chain uses when filling {context}
+    return "\n\n".join(doc.page_content for doc in docs)
+
+def stream_answer(vectorstore, query, prompt_template=CUSTOM_PROMPT_TEMPLATE, k=3):
+    """Yield the answer to `query` piece by piece as Claude generates it."""
+    docs = vectorstore.similarity_search(query, k=k)
+    prompt = set_custom_prompt(prompt_template).format(context=format_context(docs), question=query)
+    for token in get_llm().stream(prompt):
+        yield token
@@ -0,0 +1,122 @@
+import os
+import shutil
+import threading
+import time
+
+# Versioned, read-only copies of the built index for serving. database.py builds in
+# place in vectorstore/db_faiss, then publishes a copy as snapshots/<version>/ and
+# points the CURRENT file at it with os.replace, so readers only ever see complete
+# snapshots. Running apps pick the new version up through SnapshotWatcher.
+
+SNAPSHOTS_PATH = "vectorstore/snapshots"
+CURRENT_NAME = "CURRENT"
+KEEP_SNAPSHOTS = int(os.getenv("MEDIBOT_KEEP_SNAPSHOTS", "3"))
+POLL_INTERVAL = float(os.getenv("MEDIBOT_SNAPSHOT_POLL_INTERVAL", "10"))
+
+
+def current_snapshot(snapshots_path=SNAPSHOTS_PATH):
+    # Path of the published snapshot, or None if nothing has been published yet
+    try:
+        with open(os.path.join(snapshots_path, CURRENT_NAME), 'r') as f:
+            version = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return os.path.join(snapshots_path, version)
+
+def serving_path(db_path, snapshots_path=SNAPSHOTS_PATH):
+    return current_snapshot(snapshots_path) or db_path
+
+def publish_snapshot(db_path, snapshots_path=SNAPSHOTS_PATH, keep=KEEP_SNAPSHOTS):
+    """Copy the built index in `db_path` to a new snapshot and make it current."""
+    # Versions sort in publish order
+    now = time.time_ns()
+    version = time.strftime("%Y%m%d-%H%M%S", time.localtime(now // 10**9)) + f"-{now % 10**9:09d}"
+    os.makedirs(snapshots_path, exist_ok=True)
+    tmp_path = os.path.join(snapshots_path, ".tmp-" + version)
+    # copy2 keeps mtimes, so index_version() of the snapshot matches the build
+    shutil.copytree(db_path, tmp_path, ignore=shutil.ignore_patterns("*.tmp"))
+    os.rename(tmp_path, os.path.join(snapshots_path, version))
+    current_path = os.path.join(snapshots_path, CURRENT_NAME)
+    with open(current_path + ".tmp", 'w') as f:
+        f.write(version + "\n")
+    os.replace(current_path + ".tmp", current_path)
+    prune_snapshots(snapshots_path, keep)
+    return version
+
+def prune_snapshots(snapshots_path=SNAPSHOTS_PATH, keep=KEEP_SNAPSHOTS):
+    # Older snapshots are kept for a while so processes still serving them can
+    # finish in-flight requests before the files go away
+    current = current_snapshot(snapshots_path)
+    versions = sorted(name for name in os.listdir(snapshots_path)
+                      if name != CURRENT_NAME and not name.startswith("."))
+    for name in versions[:-keep] if keep > 0 else versions:
+        path = os.path.join(snapshots_path, name)
+        if path != current:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+class SnapshotWatcher:
+    """Serves the current snapshot and swaps in newly published ones.
+
+    `load(path)` builds the vectorstore for a snapshot directory and `on_load(store,
+    path)` can prepare anything derived from it (e.g. Quick Topics answers). For
+    snapshots published later both run in the background thread, so a new version
+    only replaces the old one once it is fully loaded and warm. The snapshot served
+    at start is only loaded; `on_load` isn't run for it.
+    """
+
+    def __init__(self, load, db_path, snapshots_path=SNAPSHOTS_PATH, on_load=None,
+                 interval=POLL_INTERVAL):
+        self.load = load
+        self.db_path = db_path
+        self.snapshots_path = snapshots_path
+        self.on_load = on_load
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        path = serving_path(db_path, snapshots_path)
+        self.state = (path, self._load(path))
+        self.thread = threading.Thread(target=self._run, name="medibot-snapshots", daemon=True)
+        self.thread.start()
+
+    def _load(self, path):
+        vectorstore = self.load(path)
+        # Touch the index once so the first real query doesn't pay for page faults
+        vectorstore.similarity_search("warm up", k=1)
+        return vectorstore
+
+    def _prepare(self, path):
+        vectorstore = self._load(path)
+        if self.on_load is not None:
+            try:
+                self.on_load(vectorstore, path)
+            except Exception as e:
+                # The index itself is fine; derived data is rebuilt on demand
+                print(f"Could not prepare vectorstore snapshot {path}: {e}")
+        return vectorstore
+
+    def current(self):
+        # Returns (snapshot path, vectorstore); read it once per request so both agree
+        with self.lock:
+            return self.state
+
+    def check(self):
+        path = serving_path(self.db_path, self.snapshots_path)
+        if path == self.state[0]:
+            return False
+        vectorstore = self._prepare(path)
+        with self.lock:
+            self.state = (path, vectorstore)
+        print(f"Serving vectorstore snapshot {path}")
+        return True
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                # Keep serving the old snapshot; the next poll retries
+                print(f"Could not load vectorstore snapshot: {e}")
+
+    def stop(self):
+        self.stopped.set()
@@ -0,0 +1,183 @@
+import math
+import random
+from itertools import combinations, islice
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Builds the disease/symptom datasets as a sparse CSR matrix (one row per sample,
+# one column per symptom) plus a label array, in a single pass over the symptom
+# lists instead of appending one DataFrame row at a time.
+#
+# norm dataset: one row per disease with all of its symptoms
+# comb dataset: one row per non-empty subset of each disease's symptoms
+
+LABEL_COLUMN = 'label_dis'
+
+
+def iter_norm_rows(diseases_symptoms):
+    for disease, values in diseases_symptoms.items():
+        yield disease, values
+
+def iter_comb_rows(diseases_symptoms, mode="all", max_size=None, max_rows=None, size_weights=None, seed=0):
+    """Yield (disease, subset) rows for the comb dataset.
+
+    mode="all":      every subset of size <= max_size (all sizes if None), in order,
+                     stopping after max_rows rows per disease if given
+    mode="sampled":  at most max_rows distinct random subsets per disease, split as
+                     evenly as possible across subset sizes (stratified by size)
+    mode="weighted": like "sampled" but rows are split across sizes in proportion to
+                     size_weights ({size: weight}, sizes not listed are skipped;
+                     default 1/size, favouring small subsets). Raises ValueError
+                     if a disease that needs sampling has none of the listed sizes.
+
+    Diseases with no more than max_rows subsets always get all of them, in every
+    mode. Sampling is seeded per disease, so the same settings always produce the
+    same rows.
+    """
+    if mode not in ("all", "sampled", "weighted"):
+        raise ValueError(f"Unknown combination mode: {mode}")
+    if mode != "all" and not max_rows:
+        raise ValueError(f"mode='{mode}' needs max_rows")
+    for disease, values in diseases_symptoms.items():
+        sizes = range(1, min(len(values), max_size or len(values)) + 1)
+        if mode == "all":
+            subsets = (subset for comb in sizes for subset in combinations(values, comb))
+            for subset in islice(subsets, max_rows):
+                yield disease, subset
+            continue
+        capacity = [math.comb(len(values), k) for k in sizes]
+        if mode == "sampled" or sum(capacity) <= max_rows:
+            weights = [1.0] * len(capacity)
+        else:
+            weights = [size_weights.get(k, 0.0) for k in sizes] if size_weights else [1.0 / k for k in sizes]
+            if not any(w > 0 for w in weights):
+                raise ValueError(f"size_weights has no positive weight for any subset size of "
+                                 f"'{disease}' (1-{len(capacity)})")
+        quotas = _allocate(capacity, weights, max_rows)
+        rng = random.Random(f"{seed}:{disease}")
+        for k, quota in zip(sizes, quotas):
+            for subset in _sample_subsets(values, k, quota, rng):
+                yield disease, subset
+
+def _allocate(capacity, weights, total):
+    # Split `total` rows across sizes by weight without exceeding any size's capacity
+    quotas = [0] * len(capacity)
+    active = [i for i, (c, w) in enumerate(zip(capacity, weights)) if c > 0 and w > 0]
+    remaining = total
+    while remaining > 0 and active:
+        budget = remaining
+        weight_sum = sum(weights[i] for i in active)
+        for i in list(active):
+            take = min(capacity[i] - quotas[i], max(1, int(budget * weights[i] / weight_sum)), remaining)
+            quotas[i] += take
+            remaining -= take
+            if quotas[i] == capacity[i]:
+                active.remove(i)
+            if remaining == 0:
+                break
+    return quotas
+
+def _sample_subsets(values, k, quota, rng):
+    total = math.comb(len(values), k)
+    if quota >= total:
+        return list(combinations(values, k))
+    if quota * 2 > total:
+        # Dense case: enumerating is cheap because total < 2 * quota
+        return rng.sample(list(combinations(values, k)), quota)
+    picked = set()
+    while len(picked) < quota:
+        picked.add(tuple(sorted(rng.sample(range(len(values)), k))))
+    return [tuple(values[i] for i in idx) for idx in sorted(picked)]
+
+def build_sparse_dataset(rows, symptoms):
+    """Collect (label, symptom list) rows into (X, labels).
+
+    X is a uint8 CSR matrix with one column per entry of `symptoms`.
+    """
+    column = {sym: i for i, sym in enumerate(symptoms)}
+    indptr = [0]
+    indices = []
+    labels = []
+    for disease, values in rows:
+        indices.extend(sorted({column[sym] for sym in values}))
+        indptr.append(len(indices))
+        labels.append(disease)
+    indices = np.asarray(indices, dtype=np.int32)
+    data = np.ones(len(indices), dtype=np.uint8)
+    X = sparse.csr_matrix((data, indices, np.asarray(indptr, dtype=np.int64)),
+                          shape=(len(labels), len(symptoms)))
+    return X, np.asarray(labels, dtype=object)
+
+
+# --------------------------
+# Export
+# --------------------------
+def _dense_blocks(X, labels, symptoms, block_size):
+    # Yields DataFrames in the original CSV layout without densifying all of X
+    columns = [LABEL_COLUMN] + list(symptoms)
+    for start in range(0, X.shape[0], block_size):
+        block = pd.DataFrame(X[start:start + block_size].toarray(), columns=columns[1:])
+        block.insert(0, LABEL_COLUMN, labels[start:start + block_size])
+        yield block
+
+def export_csv(X, labels, symptoms, path, block_size=10000, append=False):
+    for i, block in enumerate(_dense_blocks(X, labels, symptoms, block_size)):
+        first = i == 0 and not append
+        block.to_csv(path, index=None, mode='w' if first else 'a', header=first)
+    if X.shape[0] == 0 and not append:
+        pd.DataFrame(columns=[LABEL_COLUMN] + list(symptoms)).to_csv(path, index=None)
+
+def export_parquet(X, labels, symptoms, path, block_size=10000):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    writer = None
+    for block in _dense_blocks(X, labels, symptoms, block_size):
+        table = pa.Table.from_pandas(block, preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(path, table.schema)
+        writer.write_table(table)
+    if writer is not None:
+        writer.close()
+
+def export_npz(X, labels, symptoms, path):
+    X = X.tocsr()
+    np.savez_compressed(path, data=X.data, indices=X.indices, indptr=X.indptr, shape=X.shape,
+                        labels=labels.astype(str), symptoms=np.asarray(symptoms, dtype=str))
+
+def load_npz(path):
+    # Returns (X, labels, symptoms) as written by export_npz
+    with np.load(path) as f:
+        X = sparse.csr_matrix((f['data'], f['indices'], f['indptr']), shape=tuple(f['shape']))
+        return X, f['labels'].astype(object), f['symptoms'].tolist()
+
+def export_dataset(X, labels, symptoms, path):
+    # Format is picked from the file extension: .csv, .parquet or .npz
+    if path.endswith('.csv'):
+        export_csv(X, labels, symptoms, path)
+    elif path.endswith('.parquet'):
+        export_parquet(X, labels, symptoms, path)
+    elif path.endswith('.npz'):
+        export_npz(X, labels, symptoms, path)
+    else:
+        raise ValueError(f"Unsupported dataset format: {path}")
+
+def write_rows(rows, symptoms, path, block_size=10000):
+    """Write rows from a generator to disk and return the number of rows written.
+
+    CSV is written block_size rows at a time, so the dense dataset is never held in
+    memory; other formats are collected into one sparse matrix first.
+    """
+    if not path.endswith('.csv'):
+        X, labels = build_sparse_dataset(rows, symptoms)
+        export_dataset(X, labels, symptoms, path)
+        return X.shape[0]
+    rows = iter(rows)
+    n_rows = 0
+    while True:
+        X, labels = build_sparse_dataset(islice(rows, block_size), symptoms)
+        if X.shape[0] or n_rows == 0:
+            export_csv(X, labels, symptoms, path, block_size, append=n_rows > 0)
+        n_rows += X.shape[0]
+        if X.shape[0] < block_size:
+            return n_rows
@@ -0,0 +1,45 @@
+import asyncio
+import time
+from typing import Iterator, AsyncIterator
+from langchain_core.language_models.llms import LLM
+from langchain_core.outputs import GenerationChunk
+
+# Local stand-in for ClaudeLLM: returns a canned answer with a configurable delay
+# before the first token and a fixed token rate afterwards, so the rest of the
+# pipeline can be benchmarked and tested without Bedrock credentials or a GPU.
+
+class StubLLM(LLM):
+    latency: float = 0.5  # seconds before the first token
+    tokens_per_second: float = 0.0  # 0 returns every token at once
+    answer: str = "This is a stub answer generated without calling a model."
+
+    def _tokens(self):
+        words = self.answer.split(" ")
+        return [word if i == 0 else " " + word for i, word in enumerate(words)]
+
+    def _token_delay(self):
+        return 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    def _call(self, prompt: str, **kwargs) -> str:
+        time.sleep(self.latency + self._token_delay() * len(self._tokens()))
+        return self.answer
+
+    async def _acall(self, prompt: str, stop=None, run_manager=None, **kwargs) -> str:
+        await asyncio.sleep(self.latency + self._token_delay() * len(self._tokens()))
+        return self.answer
+
+    def _stream(self, prompt: str, stop=None, run_manager=None, **kwargs) -> Iterator[GenerationChunk]:
+        time.sleep(self.latency)
+        for token in self._tokens():
+            time.sleep(self._token_delay())
+            yield GenerationChunk(text=token)
+
+    async def _astream(self, prompt: str, stop=None, run_manager=None, **kwargs) -> AsyncIterator[GenerationChunk]:
+        await asyncio.sleep(self.latency)
+        for token in self._tokens():
+            await asyncio.sleep(self._token_delay())
+            yield GenerationChunk(text=token)
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
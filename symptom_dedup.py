@@ -0,0 +1,71 @@
+import math
+from collections import Counter, defaultdict
+
+# Finds symptoms whose synonym sets have Jaccard similarity above a threshold
+# without comparing every pair. Candidate pairs come from an inverted token index
+# over each set's prefix (tokens ordered rarest first): two sets can only reach
+# the threshold if their prefixes share a token, and only if their sizes are
+# close enough. Candidates are then verified exactly. Matches are merged with
+# union-find so chains a~b~c all map to one representative.
+
+
+def jaccard_pairs(sets, threshold):
+    """Yield (i, j, jaccard) for every pair of sets with jaccard > threshold."""
+    sets = [frozenset(s) for s in sets]
+    freq = Counter(token for s in sets for token in s)
+    prefixes = []
+    for s in sets:
+        tokens = sorted(s, key=lambda token: (freq[token], token))
+        prefixes.append(tokens[:len(tokens) - math.ceil(threshold * len(tokens)) + 1])
+    index = defaultdict(list)
+    # Smaller sets first, so every indexed set is no larger than the current one
+    for x in sorted(range(len(sets)), key=lambda i: len(sets[i])):
+        if not sets[x]:
+            continue
+        min_size = threshold * len(sets[x])
+        candidates = {y for token in prefixes[x] for y in index[token] if len(sets[y]) >= min_size}
+        for y in candidates:
+            overlap = len(sets[x] & sets[y])
+            jaccard = overlap / (len(sets[x]) + len(sets[y]) - overlap)
+            if jaccard > threshold:
+                yield min(x, y), max(x, y), jaccard
+        for token in prefixes[x]:
+            index[token].append(x)
+
+
+class UnionFind:
+    # The root of each group is its smallest index, i.e. the highest-priority member
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i, j):
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            self.parent[max(ri, rj)] = min(ri, rj)
+
+
+def match_symptoms(symptoms, synonym_sets, threshold=0.75):
+    """Group symptoms with similar synonym sets.
+
+    `symptoms` is in priority order (earlier ones are kept as representatives);
+    `synonym_sets` maps each symptom to its synonym words. Returns (symptom_match,
+    pairs): symptom_match maps every merged symptom to its representative, pairs
+    lists the matched (symptom, symptom) pairs.
+    """
+    groups = UnionFind(len(symptoms))
+    pairs = []
+    for i, j, _ in sorted(jaccard_pairs([synonym_sets[s] for s in symptoms], threshold)):
+        groups.union(i, j)
+        pairs.append((symptoms[i], symptoms[j]))
+    symptom_match = {}
+    for i, symptom in enumerate(symptoms):
+        root = groups.find(i)
+        if root != i:
+            symptom_match[symptom] = symptoms[root]
+    return symptom_match, pairs
@@ -0,0 +1,72 @@
+from functools import cached_property
+import numpy as np
+
+# Precomputed disease/symptom lookups for the symptom suggestion step:
+#   matrix        binary disease x symptom matrix
+#   symptom_bits  symptom -> bitset of the diseases that list it
+#   cooccurrence  symptom x symptom count of diseases listing both (computed on
+#                 first use; only cooccurring() needs it)
+# so suggesting the next symptoms is a few array operations instead of a scan
+# over the dataset rows per selected symptom.
+
+
+class SymptomIndex:
+    def __init__(self, matrix, diseases, symptoms):
+        self.matrix = np.asarray(matrix, dtype=np.uint8)
+        self.diseases = list(diseases)
+        self.symptoms = list(symptoms)
+        self.symptom_pos = {sym: i for i, sym in enumerate(self.symptoms)}
+        self.symptom_bits = np.packbits(self.matrix.T.astype(bool), axis=1)
+
+    @cached_property
+    def cooccurrence(self):
+        counts = self.matrix.astype(np.int32)
+        return counts.T @ counts
+
+    @classmethod
+    def build(cls, diseases_symptoms, symptoms, diseases=None):
+        # `diseases` fixes the row order, e.g. to match a classifier's classes_
+        diseases = list(diseases) if diseases is not None else list(diseases_symptoms)
+        pos = {sym: i for i, sym in enumerate(symptoms)}
+        matrix = np.zeros((len(diseases), len(symptoms)), dtype=np.uint8)
+        for row, disease in enumerate(diseases):
+            matrix[row, [pos[sym] for sym in diseases_symptoms[disease]]] = 1
+        return cls(matrix, diseases, symptoms)
+
+    def save(self, path):
+        np.savez(path, matrix=self.matrix, diseases=np.asarray(self.diseases, dtype=str),
+                 symptoms=np.asarray(self.symptoms, dtype=str))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as f:
+            return cls(f['matrix'], f['diseases'].tolist(), f['symptoms'].tolist())
+
+    def disease_symptoms(self, disease):
+        row = self.diseases.index(disease)
+        return [self.symptoms[i] for i in np.flatnonzero(self.matrix[row])]
+
+    def diseases_with_any(self, selected):
+        # Boolean mask over diseases listing at least one of the selected symptoms
+        idx = [self.symptom_pos[sym] for sym in selected]
+        if not idx:
+            return np.zeros(len(self.diseases), dtype=bool)
+        bits = np.bitwise_or.reduce(self.symptom_bits[idx], axis=0)
+        return np.unpackbits(bits, count=len(self.diseases)).astype(bool)
+
+    def suggest(self, selected):
+        """Symptoms of the diseases that list any selected symptom, as (symptom, count)
+        pairs sorted by how many of those diseases list them."""
+        idx = [self.symptom_pos[sym] for sym in selected]
+        counts = self.matrix[self.diseases_with_any(selected)].sum(axis=0, dtype=np.int64)
+        counts[idx] = 0
+        order = np.argsort(-counts, kind='stable')
+        return [(self.symptoms[i], int(counts[i])) for i in order if counts[i] > 0]
+
+    def cooccurring(self, selected):
+        # Alternative ranking: summed pairwise co-occurrence with the selected symptoms
+        idx = [self.symptom_pos[sym] for sym in selected]
+        counts = self.cooccurrence[idx].sum(axis=0, dtype=np.int64)
+        counts[idx] = 0
+        order = np.argsort(-counts, kind='stable')
+        return [(self.symptoms[i], int(counts[i])) for i in order if counts[i] > 0]
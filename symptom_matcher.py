@@ -0,0 +1,28 @@
+from collections import Counter, defaultdict
+
+# Matches expanded user symptoms against the dataset symptom vocabulary. A dataset
+# symptom matches when more than `threshold` of its words occur in one user
+# symptom's expansion. A token -> symptom index and per-symptom token counts are
+# built once, so each query only touches the symptoms sharing a word with it.
+
+
+class SymptomMatcher:
+    def __init__(self, dataset_symptoms):
+        self.symptoms = list(dataset_symptoms)
+        self.token_counts = [len(sym.split()) for sym in self.symptoms]
+        self.index = defaultdict(list)  # token -> [(symptom position, occurrences)]
+        for pos, sym in enumerate(self.symptoms):
+            for token, occurrences in Counter(sym.split()).items():
+                self.index[token].append((pos, occurrences))
+
+    def match(self, user_symptoms, threshold=0.5):
+        """Dataset symptoms matching any of the expanded user symptom strings, in
+        vocabulary order."""
+        found = set()
+        for user_sym in user_symptoms:
+            hits = Counter()
+            for token in set(user_sym.split()):
+                for pos, occurrences in self.index.get(token, ()):
+                    hits[pos] += occurrences
+            found.update(pos for pos, count in hits.items() if count / self.token_counts[pos] > threshold)
+        return [self.symptoms[pos] for pos in sorted(found)]
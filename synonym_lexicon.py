@@ -0,0 +1,121 @@
+import gzip
+import json
+import os
+import time
+from functools import lru_cache
+from itertools import combinations
+from bs4 import BeautifulSoup
+from nltk.corpus import wordnet
+from fetcher import get_fetcher
+
+# Prebuilt synonym lexicon used for symptom query expansion. Thesaurus.com and
+# WordNet are only consulted when the lexicon is (re)built; lookups afterwards are
+# local and memoized. Terms missing from the lexicon fall back to WordNet alone.
+#
+# File layout (gzipped JSON):
+#   {"format": 1, "revision": N, "updated": "...", "entries": {term: [synonyms]}}
+# `revision` goes up every time new terms are added.
+
+LEXICON_PATH = "lexicon/synonyms.json.gz"
+LEXICON_FORMAT = 1
+
+
+# --------------------------
+# Sources (only used while building)
+# --------------------------
+def thesaurus_synonyms(term):
+    # Synonyms of the input word from thesaurus.com (https://www.thesaurus.com/)
+    synonyms = []
+    content = get_fetcher().get('https://www.thesaurus.com/browse/{}'.format(term))
+    soup = BeautifulSoup(content,  "html.parser")
+    try:
+        container=soup.find('section', {'class': 'MainContentContainer'}) 
+        row=container.find('div',{'class':'css-191l5o0-ClassicContentCard'})
+        row = row.find_all('li')
+        for x in row:
+            synonyms.append(x.get_text())
+    except:
+        None
+    return synonyms
+
+def wordnet_synonyms(term):
+    # Synonyms of the input word from wordnet (https://www.nltk.org/howto/wordnet.html)
+    synonyms = []
+    for syn in wordnet.synsets(term):
+        synonyms+=syn.lemma_names()
+    return synonyms
+
+def phrase_subsets(phrase):
+    # Every sub-phrase (in word order) that query expansion looks up
+    words = phrase.split()
+    return [' '.join(subset) for comb in range(1, len(words)+1) for subset in combinations(words, comb)]
+
+
+# --------------------------
+# Lexicon file
+# --------------------------
+def read_lexicon(path=LEXICON_PATH):
+    if not os.path.exists(path):
+        return {"format": LEXICON_FORMAT, "revision": 0, "updated": None, "entries": {}}
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        lexicon = json.load(f)
+    if lexicon.get("format") != LEXICON_FORMAT:
+        raise ValueError(f"Unsupported lexicon format in {path}: {lexicon.get('format')}")
+    return lexicon
+
+def write_lexicon(lexicon, path=LEXICON_PATH):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + ".tmp"
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        json.dump(lexicon, f, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def fetch_entries(terms, fetch=thesaurus_synonyms):
+    # {term: sorted synonyms} from the online thesaurus plus WordNet; pages are
+    # fetched concurrently through the shared rate-limited, cached fetcher
+    terms = list(terms)
+    online = get_fetcher().map(fetch, terms)
+    return {term: sorted(set(found) | set(wordnet_synonyms(term))) for term, found in zip(terms, online)}
+
+def update_lexicon(terms, path=LEXICON_PATH, fetch=thesaurus_synonyms):
+    """Add entries for the terms the lexicon doesn't have yet and save a new revision.
+
+    Returns the number of terms added.
+    """
+    lexicon = read_lexicon(path)
+    missing = sorted(set(terms) - set(lexicon["entries"]))
+    if not missing:
+        return 0
+    lexicon["entries"].update(fetch_entries(missing, fetch))
+    lexicon["revision"] += 1
+    lexicon["updated"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    write_lexicon(lexicon, path)
+    load_lexicon.cache_clear()
+    synonyms.cache_clear()
+    return len(missing)
+
+
+# --------------------------
+# Lookup
+# --------------------------
+@lru_cache(maxsize=None)
+def load_lexicon(path=LEXICON_PATH):
+    return read_lexicon(path)["entries"]
+
+@lru_cache(maxsize=65536)
+def synonyms(term):
+    """Synonyms of `term` (including multi-word lemma names), as a frozenset."""
+    entries = load_lexicon()
+    if term in entries:
+        return frozenset(entries[term])
+    return frozenset(wordnet_synonyms(term))
+
+
+if __name__ == "__main__":
+    # python synonym_lexicon.py terms.txt  -- one symptom per line; all sub-phrases are added
+    import sys
+    with open(sys.argv[1], 'r', encoding='utf-8') as f:
+        phrases = [line.strip() for line in f if line.strip()]
+    terms = {subset for phrase in phrases for subset in phrase_subsets(phrase)}
+    added = update_lexicon(terms)
+    print(f"Added {added} terms; lexicon has {len(load_lexicon())} entries")
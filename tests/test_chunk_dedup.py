@@ -0,0 +1,46 @@
+from chunk_dedup import ChunkDeduper
+
+TEXT = ("Keep this medicine out of the reach of children and store it below 25 degrees. "
+        "Consult your doctor before use if you are pregnant or breastfeeding.")
+OTHER = "Paracetamol is used to treat mild to moderate pain and to reduce fever in adults and children."
+
+
+def test_exact_duplicate_after_normalization():
+    deduper = ChunkDeduper()
+    assert deduper.add("a", TEXT) is None
+    assert deduper.add("b", TEXT.upper().replace(".", " ;")) == "a"
+    assert deduper.add("c", OTHER) is None
+
+
+def test_near_duplicate():
+    deduper = ChunkDeduper()
+    deduper.add("a", TEXT)
+    assert deduper.add("b", TEXT + " Page 12") == "a"
+
+
+def test_removed_chunks_no_longer_match():
+    deduper = ChunkDeduper()
+    deduper.add("a", TEXT)
+    deduper.remove(["a", "unknown"])
+    assert deduper.add("b", TEXT) is None
+    assert deduper.add("c", TEXT) == "b"
+
+
+def test_seeding_registers_duplicates_already_in_the_index():
+    deduper = ChunkDeduper.from_chunks([("a", TEXT), ("b", TEXT)])
+    assert deduper.add("c", TEXT) == "a"
+    deduper.remove(["a"])
+    assert deduper.add("d", TEXT) == "b"
+
+
+def test_save_and_load(tmp_path):
+    assert ChunkDeduper.load(str(tmp_path)) is None
+    deduper = ChunkDeduper.from_chunks([("a", TEXT), ("b", OTHER), ("empty", "  ")])
+    deduper.remove(["b"])
+    deduper.save(str(tmp_path))
+
+    loaded = ChunkDeduper.load(str(tmp_path))
+    assert set(loaded.positions) == {"a", "empty"}
+    assert loaded.add("c", TEXT + " Page 3") == "a"
+    assert loaded.add("d", OTHER) is None
+    assert loaded.add("e", "") == "empty"
@@ -0,0 +1,41 @@
+import numpy as np
+from disease_ranking import DiseaseRanker
+from symptom_index import SymptomIndex
+
+
+class FixedClassifier:
+    # Stand-in for a fitted sklearn classifier with fixed probabilities
+    def __init__(self, classes, proba):
+        self.classes_ = np.array(classes)
+        self.proba = np.array(proba, dtype=np.float64)
+
+    def predict_proba(self, X):
+        return np.tile(self.proba, (len(X), 1))
+
+
+def make_ranker(proba, score=1.0):
+    # Index rows are in a different order than the classifier's classes
+    index = SymptomIndex.build({"cold": ["cough", "sneeze"], "flu": ["cough", "fever"], "rash": ["itch"]},
+                               ["cough", "fever", "itch", "sneeze"], diseases=["rash", "flu", "cold"])
+    return DiseaseRanker(FixedClassifier(["cold", "flu", "rash"], proba), index, score)
+
+
+def test_rank_orders_by_match_score_then_probability():
+    ranker = make_ranker([0.5, 0.3, 0.2])
+    assert [d for d, _ in ranker.rank_symptoms([["cough", "fever"]], k=3)[0]] == ["flu", "cold", "rash"]
+    # cold and flu match "cough" equally, so the more probable cold comes first
+    assert [d for d, _ in ranker.rank_symptoms([["cough"]], k=3)[0]] == ["cold", "flu", "rash"]
+
+
+def test_rank_keeps_only_the_k_most_probable():
+    ranker = make_ranker([0.1, 0.3, 0.6])
+    ranked = ranker.rank_symptoms([["cough", "sneeze"]], k=2)[0]
+    assert [d for d, _ in ranked] == ["flu", "rash"]
+
+
+def test_rank_scores_and_batches():
+    ranker = make_ranker([0.5, 0.3, 0.2], score=0.5)
+    indices, scores = ranker.rank(ranker.vectorize([["cough", "fever"], ["itch"]]), k=10)
+    assert indices.shape == scores.shape == (2, 3)
+    assert [ranker.classes[i] for i in indices[1]] == ["rash", "cold", "flu"]
+    np.testing.assert_allclose(scores[0], [3 / 3 * 0.5, 2 / 3 * 0.5, 1 / 3 * 0.5])
@@ -0,0 +1,58 @@
+import json
+import os
+import numpy as np
+from embeddings import EmbeddingCache
+
+
+def test_orphaned_vectors_are_dropped_on_load(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "model")
+    cache.put_many(["a", "b"], np.array([[0, 0, 0], [2, 2, 2]], dtype=np.float32))
+    # Simulate a crash after the vectors were appended but before the key was
+    with open(cache.vectors_path, 'ab') as f:
+        f.write(np.ones((1, 3), dtype=np.float32).tobytes())
+
+    cache = EmbeddingCache(str(tmp_path), "model")
+    cache.put_many(["c"], np.array([[3, 3, 3]], dtype=np.float32))
+    found = EmbeddingCache(str(tmp_path), "model").get_many(["a", "b", "c"])
+    assert found["b"].tolist() == [2, 2, 2]
+    assert found["c"].tolist() == [3, 3, 3]
+
+
+def test_partial_key_line_is_dropped_on_load(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "model")
+    cache.put_many(["a"], np.array([[1, 1]], dtype=np.float32))
+    with open(cache.vectors_path, 'ab') as f:
+        f.write(np.full((1, 2), 9, dtype=np.float32).tobytes())
+    with open(cache.keys_path, 'a') as f:
+        f.write("par")
+
+    cache = EmbeddingCache(str(tmp_path), "model")
+    cache.put_many(["c"], np.array([[3, 3]], dtype=np.float32))
+    found = EmbeddingCache(str(tmp_path), "model").get_many(["a", "par", "c"])
+    assert set(found) == {"a", "c"}
+    assert found["c"].tolist() == [3, 3]
+
+
+def test_meta_without_keys_or_vectors(tmp_path):
+    cache_dir = tmp_path / "model"
+    cache_dir.mkdir()
+    with open(cache_dir / "meta.json", 'w') as f:
+        json.dump({"dim": 2}, f)
+
+    cache = EmbeddingCache(str(tmp_path), "model")
+    assert cache.get_many(["a"]) == {}
+    cache.put_many(["a"], np.array([[1, 2]], dtype=np.float32))
+    assert EmbeddingCache(str(tmp_path), "model").get_many(["a"])["a"].tolist() == [1, 2]
+    assert os.path.getsize(cache.vectors_path) == 8
+
+
+def test_writer_picks_up_rows_appended_by_another_process(tmp_path):
+    first = EmbeddingCache(str(tmp_path), "model")
+    first.put_many(["a"], np.array([[1, 1]], dtype=np.float32))
+    second = EmbeddingCache(str(tmp_path), "model")
+    second.put_many(["b"], np.array([[2, 2]], dtype=np.float32))
+
+    first.put_many(["c"], np.array([[3, 3]], dtype=np.float32))
+    found = EmbeddingCache(str(tmp_path), "model").get_many(["a", "b", "c"])
+    assert {key: vector.tolist() for key, vector in found.items()} == {"a": [1, 1], "b": [2, 2], "c": [3, 3]}
+    assert first.get_many(["b"])["b"].tolist() == [2, 2]
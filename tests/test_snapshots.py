@@ -0,0 +1,90 @@
+import os
+import pytest
+from snapshots import SnapshotWatcher, current_snapshot, prune_snapshots, publish_snapshot, serving_path
+
+
+class FakeStore:
+    def __init__(self, path):
+        self.path = path
+
+    def similarity_search(self, query, k=4):
+        return []
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "db"
+    path.mkdir()
+    (path / "index.faiss").write_text("v1")
+    return str(path)
+
+
+def test_publish_switches_current_and_keeps_files(db_path, tmp_path):
+    snapshots = str(tmp_path / "snapshots")
+    assert serving_path(db_path, snapshots) == db_path
+    version = publish_snapshot(db_path, snapshots)
+    assert current_snapshot(snapshots) == os.path.join(snapshots, version)
+    assert serving_path(db_path, snapshots) == os.path.join(snapshots, version)
+    with open(os.path.join(snapshots, version, "index.faiss")) as f:
+        assert f.read() == "v1"
+
+
+def test_prune_keeps_newest_and_current(db_path, tmp_path):
+    snapshots = str(tmp_path / "snapshots")
+    versions = [publish_snapshot(db_path, snapshots, keep=0) for _ in range(4)]
+    assert versions == sorted(versions)
+    assert sorted(os.listdir(snapshots)) == [versions[-1], "CURRENT"]
+    prune_snapshots(snapshots, keep=0)
+    assert current_snapshot(snapshots) == os.path.join(snapshots, versions[-1])
+
+
+def test_watcher_swaps_in_new_snapshots(db_path, tmp_path):
+    snapshots = str(tmp_path / "snapshots")
+    prepared = []
+    watcher = SnapshotWatcher(FakeStore, db_path, snapshots, on_load=lambda store, path: prepared.append(path),
+                              interval=3600)
+    try:
+        assert watcher.current()[0] == db_path
+        assert prepared == []  # the initial snapshot is served without on_load
+        assert not watcher.check()
+
+        version = publish_snapshot(db_path, snapshots)
+        assert watcher.check()
+        path, store = watcher.current()
+        assert path == store.path == os.path.join(snapshots, version)
+        assert prepared == [path]
+    finally:
+        watcher.stop()
+
+
+def test_watcher_keeps_serving_when_a_snapshot_fails_to_load(db_path, tmp_path):
+    snapshots = str(tmp_path / "snapshots")
+
+    def load(path):
+        if path != db_path:
+            raise RuntimeError("corrupt snapshot")
+        return FakeStore(path)
+
+    watcher = SnapshotWatcher(load, db_path, snapshots, interval=3600)
+    try:
+        publish_snapshot(db_path, snapshots)
+        with pytest.raises(RuntimeError):
+            watcher.check()
+        assert watcher.current()[0] == db_path
+    finally:
+        watcher.stop()
+
+
+def test_on_load_failure_does_not_block_the_swap(db_path, tmp_path):
+    snapshots = str(tmp_path / "snapshots")
+
+    def on_load(store, path):
+        raise RuntimeError("LLM unavailable")
+
+    watcher = SnapshotWatcher(FakeStore, db_path, snapshots, on_load=on_load, interval=3600)
+    try:
+        version = publish_snapshot(db_path, snapshots)
+        assert watcher.check()
+        assert watcher.current()[0] == os.path.join(snapshots, version)
+    finally:
+        watcher.stop()
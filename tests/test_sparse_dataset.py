@@ -0,0 +1,46 @@
+import math
+import pytest
+from sparse_dataset import build_sparse_dataset, iter_comb_rows
+
+SYMPTOMS = list("abcdefghij")
+DISEASES = {"small": ["a", "b", "c"], "big": SYMPTOMS}
+
+
+def rows_for(rows, disease):
+    return [subset for name, subset in rows if name == disease]
+
+
+@pytest.mark.parametrize("mode,size_weights", [("sampled", None), ("weighted", None), ("weighted", {9: 1.0})])
+def test_disease_with_few_subsets_gets_all_of_them(mode, size_weights):
+    rows = iter_comb_rows({"small": DISEASES["small"]}, mode=mode, max_rows=7, size_weights=size_weights)
+    assert sorted(map(sorted, rows_for(rows, "small"))) == sorted(
+        [["a"], ["b"], ["c"], ["a", "b"], ["a", "c"], ["b", "c"], ["a", "b", "c"]])
+
+
+def test_weighted_mode_without_any_valid_size_raises():
+    with pytest.raises(ValueError):
+        list(iter_comb_rows({"small": DISEASES["small"]}, mode="weighted", max_rows=3, size_weights={9: 1.0}))
+
+
+def test_weighted_mode_only_samples_listed_sizes():
+    rows = rows_for(iter_comb_rows(DISEASES, mode="weighted", max_rows=20, size_weights={2: 1.0}), "big")
+    assert len(rows) == 20
+    assert {len(subset) for subset in rows} == {2}
+
+
+def test_sampled_rows_are_distinct_capped_and_reproducible():
+    rows = rows_for(iter_comb_rows(DISEASES, mode="sampled", max_rows=50), "big")
+    assert len(rows) == 50
+    assert len({tuple(sorted(subset)) for subset in rows}) == 50
+    assert rows == rows_for(iter_comb_rows(DISEASES, mode="sampled", max_rows=50), "big")
+
+
+def test_all_mode_enumerates_up_to_max_size():
+    rows = rows_for(iter_comb_rows(DISEASES, mode="all", max_size=2), "big")
+    assert len(rows) == math.comb(10, 1) + math.comb(10, 2)
+
+
+def test_build_sparse_dataset():
+    X, labels = build_sparse_dataset([("flu", ["c", "a"]), ("cold", ["b"])], ["a", "b", "c"])
+    assert X.toarray().tolist() == [[1, 0, 1], [0, 1, 0]]
+    assert labels.tolist() == ["flu", "cold"]
@@ -0,0 +1,19 @@
+from symptom_index import SymptomIndex
+
+
+def make_index():
+    return SymptomIndex.build({"flu": ["cough", "fever"], "cold": ["cough", "sneeze"], "rash": ["itch"]},
+                              ["cough", "fever", "itch", "sneeze"])
+
+
+def test_cooccurrence_is_computed_on_first_use():
+    index = make_index()
+    assert "cooccurrence" not in vars(index)
+    assert index.cooccurring(["cough"]) == [("fever", 1), ("sneeze", 1)]
+    assert index.cooccurrence[0, 0] == 2
+
+
+def test_suggest_counts_symptoms_of_matching_diseases():
+    index = make_index()
+    assert index.suggest(["fever"]) == [("cough", 1)]
+    assert index.suggest(["cough"]) == [("fever", 1), ("sneeze", 1)]
@@ -0,0 +1,25 @@
+import sys
+from time import time
+import pandas as pd
+from train_stream import train_incremental, disease_symptoms_from_norm
+from disease_model import save_model, MODEL_DIR
+from symptom_index import SymptomIndex
+
+# Trains the disease-prediction model once and saves it as a versioned artifact,
+# so SymptomSuggestion.py only has to load it.
+# Usage: python train_disease_model.py [dis_sym_dataset_norm.csv] [model_dir]
+
+DATASET_NORM_PATH = sys.argv[1] if len(sys.argv) > 1 else "dis_sym_dataset_norm.csv"
+model_dir = sys.argv[2] if len(sys.argv) > 2 else MODEL_DIR
+
+t0 = time()
+df_norm = pd.read_csv(DATASET_NORM_PATH)
+symptoms = list(df_norm.columns[1:])
+diseases_symptoms = disease_symptoms_from_norm(df_norm)
+classifier, accuracy = train_incremental(diseases_symptoms, symptoms)
+print(f"Held-out accuracy: {accuracy:.4f} ({time() - t0:.1f}s)")
+
+# Index rows follow the classifier's label order
+symptom_index = SymptomIndex.build(diseases_symptoms, symptoms, diseases=classifier.classes_)
+version = save_model(classifier, symptoms, accuracy, model_dir, symptom_index, extra={"dataset": DATASET_NORM_PATH})
+print(f"Saved model {version} to {model_dir}")
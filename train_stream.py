@@ -0,0 +1,52 @@
+import random
+from collections import OrderedDict
+import numpy as np
+from sklearn.linear_model import SGDClassifier
+from sparse_dataset import build_sparse_dataset, LABEL_COLUMN
+
+# Mini-batch training on symptom subsets sampled on the fly, instead of
+# materializing every combination in dis_sym_dataset_comb.csv. Each batch is a
+# small sparse matrix, so memory stays constant however many batches are drawn.
+
+
+def disease_symptoms_from_norm(df_norm):
+    # {disease: [symptoms]} from the norm dataset (one row per disease)
+    symptoms = np.asarray(df_norm.columns[1:])
+    values = df_norm.iloc[:, 1:].to_numpy() != 0
+    return OrderedDict((disease, list(symptoms[row])) for disease, row in zip(df_norm[LABEL_COLUMN], values))
+
+def iter_minibatches(diseases_symptoms, symptoms, batch_size=256, n_batches=None, max_size=None, seed=0):
+    """Yield (X, y) batches of random symptom subsets; endless if n_batches is None.
+
+    Every row picks a disease uniformly, a subset size uniformly from
+    1..min(#symptoms, max_size), then that many of the disease's symptoms.
+    """
+    rng = random.Random(seed)
+    diseases = [disease for disease, values in diseases_symptoms.items() if values]
+    batch = 0
+    while n_batches is None or batch < n_batches:
+        rows = []
+        for _ in range(batch_size):
+            disease = rng.choice(diseases)
+            values = diseases_symptoms[disease]
+            k = rng.randint(1, min(len(values), max_size or len(values)))
+            rows.append((disease, rng.sample(values, k)))
+        yield build_sparse_dataset(rows, symptoms)
+        batch += 1
+
+def train_incremental(diseases_symptoms, symptoms, n_batches=2000, batch_size=256, max_size=None,
+                      eval_batches=20, classifier=None, seed=0):
+    """Fit a partial_fit-capable classifier on generated batches.
+
+    Returns (classifier, accuracy) where accuracy is measured on freshly generated
+    held-out batches.
+    """
+    classifier = classifier or SGDClassifier(loss="log_loss", alpha=1e-5)
+    classes = np.array(sorted(d for d, values in diseases_symptoms.items() if values), dtype=object)
+    for X, y in iter_minibatches(diseases_symptoms, symptoms, batch_size, n_batches, max_size, seed):
+        classifier.partial_fit(X, y, classes=classes)
+    correct = total = 0
+    for X, y in iter_minibatches(diseases_symptoms, symptoms, batch_size, eval_batches, max_size, seed + 1):
+        correct += int((classifier.predict(X) == y).sum())
+        total += len(y)
+    return classifier, correct / total
@@ -0,0 +1,63 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from faiss_index import load_vectorstore
+from embeddings import get_embedding_model
+from snapshots import serving_path
+from index_manifest import index_version
+from quick_topics import canned_prompts
+from rag_chain import CUSTOM_PROMPT_TEMPLATE, set_custom_prompt, format_context, get_llm
+
+# Precomputed retrieval context and answers for the Quick Topics prompts, stored
+# next to the index and tied to the index version they were computed against.
+
+DB_FAISS_PATH = "vectorstore/db_faiss"
+QUICK_ANSWERS_NAME = "quick_answers.json"
+WARMUP_WORKERS = int(os.getenv("MEDIBOT_WARMUP_WORKERS", "4"))
+
+
+def quick_answers_path(db_path):
+    return os.path.join(db_path, QUICK_ANSWERS_NAME)
+
+def load_quick_answers(db_path):
+    # Returns {prompt: answer}, or None if missing or computed for another index version
+    path = quick_answers_path(db_path)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        saved = json.load(f)
+    if saved["index_version"] != index_version(db_path) or set(saved["answers"]) != set(canned_prompts()):
+        return None
+    return {prompt: entry["answer"] for prompt, entry in saved["answers"].items()}
+
+def answer_prompt(vectorstore, prompt, k=3):
+    docs = vectorstore.similarity_search(prompt, k=k)
+    context = format_context(docs)
+    answer = get_llm().invoke(set_custom_prompt(CUSTOM_PROMPT_TEMPLATE).format(context=context, question=prompt))
+    return {"context": [doc.page_content for doc in docs], "answer": answer.strip()}
+
+def warm_quick_answers(vectorstore, db_path, workers=WARMUP_WORKERS):
+    prompts = canned_prompts()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        entries = list(executor.map(lambda prompt: answer_prompt(vectorstore, prompt), prompts))
+    saved = {"index_version": index_version(db_path), "answers": dict(zip(prompts, entries))}
+    path = quick_answers_path(db_path)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(saved, f, indent=2)
+    os.replace(tmp_path, path)
+    return {prompt: entry["answer"] for prompt, entry in saved["answers"].items()}
+
+def load_or_warm(vectorstore, db_path):
+    answers = load_quick_answers(db_path)
+    if answers is None:
+        answers = warm_quick_answers(vectorstore, db_path)
+    return answers
+
+
+if __name__ == "__main__":
+    # Answers are stored with the snapshot that is being served
+    path = serving_path(DB_FAISS_PATH)
+    db = load_vectorstore(path, get_embedding_model())
+    answers = warm_quick_answers(db, path)
+    print(f"Precomputed {len(answers)} Quick Topics answers.")